@@ -0,0 +1,176 @@
+"""
+Benchmark of `Lens.calculate` for the combinations of missing variables.
+
+The combinations are the same as in `tests/test_variable_combinations.py`
+(`combinations_passing` and `combinations_failing`). For every combination
+the time of the first calculation (which solves the equations for the known
+variables), the median and the 99th percentile of the following ones
+and the peak of the memory allocated during one calculation are measured.
+
+    $ python benchmarks/combinations.py --output results.json
+    $ python benchmarks/combinations.py --baseline results.json --threshold 1.5
+
+With `--baseline` the results are compared to earlier results
+and the benchmark fails if some combination got slower.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from copy import deepcopy
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "tests")]
+
+from combinations_for_tests import combinations_failing, combinations_passing  # noqa: E402
+from test_variable_combinations import ORIGINAL_LENS  # noqa: E402
+
+
+def percentile(values, percent):
+    """
+    Return the `percent` percentile of the `values` (nearest rank).
+    """
+    values = sorted(values)
+    return values[max(0, -(-len(values) * percent // 100) - 1)]
+
+
+def calculate(left_out, method, failing=False):
+    """
+    Calculate the original lens without the `left_out` variables.
+    The `ValueError` of the calculation is ignored only if it is `failing`.
+
+    Return the time of the calculation in seconds.
+    """
+    lens = deepcopy(ORIGINAL_LENS)
+    for variable in left_out:
+        setattr(lens, variable, None)
+
+    start = time.perf_counter()
+    try:
+        lens.calculate(method)
+    except ValueError:
+        if not failing:
+            raise
+    return time.perf_counter() - start
+
+
+def measure(left_out, repeat, method, failing=False):
+    """
+    Measure the calculation of the lens without the `left_out` variables.
+    """
+    cold = calculate(left_out, method, failing)
+    times = [calculate(left_out, method, failing) for _ in range(repeat)]
+
+    tracemalloc.start()
+    try:
+        calculate(left_out, method, failing)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "cold": cold,
+        "median": statistics.median(times),
+        "p99": percentile(times, 99),
+        "peak_memory": peak,
+    }
+
+
+def run(kind="all", repeat=20, sample=None, seed=0, method="symbolic"):
+    """
+    Run the benchmark, return the results for each combination
+    (the missing variables separated by commas).
+
+    The result of a passing combination whose calculation failed
+    has only the status and the error.
+    """
+    combinations = []
+    if kind in ("all", "passing"):
+        combinations += [(left_out, "passing") for left_out in combinations_passing]
+    if kind in ("all", "failing"):
+        combinations += [(left_out, "failing") for left_out in combinations_failing]
+    if sample is not None and sample < len(combinations):
+        combinations = random.Random(seed).sample(combinations, sample)
+
+    results = {}
+    for left_out, status in combinations:
+        try:
+            result = measure(left_out, repeat, method, status == "failing")
+        except ValueError as error:
+            result = {"error": str(error)}
+        results[",".join(left_out)] = {"status": status, **result}
+
+    return results
+
+
+def compare(results, baseline, threshold, noise):
+    """
+    Return the combinations whose median time is `threshold` times
+    longer than in the `baseline` (and longer at least by `noise` seconds).
+    """
+    slower = {}
+    for combination, result in results.items():
+        if combination not in baseline or "error" in result or "error" in baseline[combination]:
+            continue
+        before, after = baseline[combination]["median"], result["median"]
+        if after > threshold * before and after - before > noise:
+            slower[combination] = (before, after)
+
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure Lens.calculate for the combinations of missing variables.")
+    parser.add_argument("--kind", choices=("all", "passing", "failing"), default="all", help="which combinations (default: all)")
+    parser.add_argument("--repeat", type=int, default=20, help="number of calculations of every combination (default: 20)")
+    parser.add_argument("--sample", type=int, help="measure only a random sample of the combinations")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random sample (default: 0)")
+    parser.add_argument("--method", choices=("symbolic", "numeric"), default="symbolic")
+    parser.add_argument("--output", "-o", type=Path, help="file for the results (JSON)")
+    parser.add_argument("--baseline", type=Path, help="earlier results (JSON) to compare with")
+    parser.add_argument("--threshold", type=float, default=1.5, help="allowed slowdown against the baseline (default: 1.5)")
+    parser.add_argument("--noise", type=float, default=5e-5, help="ignored slowdown in seconds (default: 5e-5)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run(args.kind, args.repeat, args.sample, args.seed, args.method)
+    elapsed = time.perf_counter() - start
+
+    if args.output is not None:
+        meta = {"python": platform.python_version(), "method": args.method, "repeat": args.repeat}
+        args.output.write_text(json.dumps({"meta": meta, "results": results}, indent=1))
+
+    errors = {combination: result["error"] for combination, result in results.items() if "error" in result}
+    measured = {combination: result for combination, result in results.items() if "error" not in result}
+
+    print(f"{len(results)} combinations measured in {elapsed:.1f} s")
+    print("The slowest combinations (median, p99, first calculation):")
+    for combination, result in sorted(measured.items(), key=lambda item: -item[1]["median"])[:10]:
+        print(f"  {combination:30} {result['median'] * 1000:9.3f} ms {result['p99'] * 1000:9.3f} ms {result['cold']:8.3f} s")
+
+    for combination, error in sorted(errors.items()):
+        print(f"{combination}: {error}", file=sys.stderr)
+    if errors:
+        print(f"{len(errors)} passing combinations failed to calculate!", file=sys.stderr)
+        return 1
+
+    if args.baseline is None:
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())["results"]
+    slower = compare(results, baseline, args.threshold, args.noise)
+    for combination, (before, after) in sorted(slower.items()):
+        print(f"{combination}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms", file=sys.stderr)
+    if slower:
+        print(f"{len(slower)} combinations are slower than the baseline!", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Benchmark of the startup of lenscalc.
+
+Measure how long `python -c "import lenscalc"` takes and how much memory
+the process uses at its peak. Every run is a new Python process,
+the median of the runs is reported.
+
+    $ python benchmarks/startup.py --repeat 20 --max-time 0.1 --max-memory 50
+
+With `--max-time` (seconds) or `--max-memory` (MB) the benchmark fails
+when the startup is slower or bigger, so that the regressions are caught.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Run in a new process, prints the import time, the peak memory (MB)
+# and which of the big dependencies were imported.
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import lenscalc
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere.
+    peak /= 2 ** 20 if sys.platform == "darwin" else 2 ** 10
+except ImportError:  # Windows
+    peak = None
+print(json.dumps({
+    "time": elapsed,
+    "memory": peak,
+    "modules": sorted(m for m in ("sympy", "numpy", "mpmath") if m in sys.modules),
+}))
+"""
+
+
+def measure(repeat):
+    """
+    Import lenscalc `repeat` times, each time in a new process.
+
+    Return a dictionary with the median import time (seconds),
+    the median peak memory (MB) and the imported big dependencies.
+    """
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD], cwd=ROOT, check=True, capture_output=True, text=True,
+        ).stdout
+        runs.append(json.loads(output))
+
+    memory = [run["memory"] for run in runs if run["memory"] is not None]
+    return {
+        "time": statistics.median(run["time"] for run in runs),
+        "memory": statistics.median(memory) if memory else None,
+        "modules": runs[0]["modules"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the startup of lenscalc.")
+    parser.add_argument("--repeat", type=int, default=10, help="number of runs (default: %(default)s)")
+    parser.add_argument("--max-time", type=float, help="fail if the import takes longer (seconds)")
+    parser.add_argument("--max-memory", type=float, help="fail if the peak memory is higher (MB)")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args(argv)
+
+    result = measure(args.repeat)
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"import time: {result['time'] * 1000:.1f} ms")
+        if result["memory"] is not None:
+            print(f"peak memory: {result['memory']:.1f} MB")
+        print(f"imported: {', '.join(result['modules']) or 'no big dependencies'}")
+
+    failed = False
+    if args.max_time is not None and result["time"] > args.max_time:
+        print(f"The import takes longer than {args.max_time} s!", file=sys.stderr)
+        failed = True
+    if args.max_memory is not None and result["memory"] is not None and result["memory"] > args.max_memory:
+        print(f"The peak memory is higher than {args.max_memory} MB!", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
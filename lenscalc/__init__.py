@@ -0,0 +1,23 @@
+from importlib import import_module
+
+from .lens import Lens
+from .compact import CompactLens
+
+# These need NumPy, they are imported when they are used for the first time
+# so that importing lenscalc stays fast.
+_lazy = {
+    "LensTable": ".table",
+    "LensCatalog": ".catalog",
+    "LensSystem": ".system",
+    "ConjugateLens": ".conjugate",
+    "trace": ".raytrace",
+    "sweep": ".analysis",
+    "tolerance": ".analysis",
+    "design": ".optimize",
+}
+
+
+def __getattr__(name):
+    if name in _lazy:
+        return getattr(import_module(_lazy[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
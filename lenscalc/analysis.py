@@ -0,0 +1,232 @@
+"""
+Calculation of lenses derived from one lens.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+import numpy as np
+
+from .compact import CompactLens
+from .lens import Lens
+from .parallel import signature, warm_up
+from .table import LensTable
+
+
+def given_values(base):
+    """
+    Return the given (not calculated) values of the `base` lens
+    (`Lens`, `CompactLens`, a row of `LensTable`)
+    or a dictionary of the known variables.
+    """
+    if isinstance(base, dict):
+        return {variable: value for variable, value in base.items() if value is not None}
+    if isinstance(base, CompactLens):
+        return base.given
+    if not isinstance(base, Lens):
+        raise TypeError(f"The given values of {type(base).__name__} can't be told apart from the calculated ones!")
+
+    calculated = base._calculated or {}
+    return {
+        variable: value
+        for variable in Lens.variables
+        if (value := getattr(base, variable)) is not None and variable not in calculated
+    }
+
+
+def _check_known(known):
+    # The values calculated from the others can't be given too,
+    # the lenses would be inconsistent.
+    if (structure := Lens.structure(known)).status == "over-determined":
+        raise ValueError(f"The variables over-determine the lens, remove one of: {', '.join(structure.redundant)}")
+
+
+def sweep(base, vary, mode="grid"):
+    """
+    Calculate the `base` lens (or a dictionary of the known variables)
+    with the values of the variables in `vary` (a dictionary mapping
+    the variables to sequences of their values).
+
+    With `mode="grid"` all the combinations of the values are calculated
+    (the first variable changes the slowest, so the columns can be reshaped
+    to the lengths of the sequences), with `mode="zip"` the sequences
+    have to have the same length and their values are used together.
+    Return `LensTable` with the calculated lenses.
+    """
+    if mode not in ("grid", "zip"):
+        raise ValueError(f"Unknown mode: {mode}")
+    if not vary:
+        raise ValueError("No variables to vary were given!")
+
+    arrays = [np.asarray(values, dtype=float).ravel() for values in vary.values()]
+    if mode == "grid":
+        arrays = [array.ravel() for array in np.meshgrid(*arrays, indexing="ij")]
+    elif len({len(array) for array in arrays}) > 1:
+        raise ValueError("The values of the variables have to have the same length!")
+
+    known = {**given_values(base), **dict(zip(vary, arrays))}
+    _check_known(known)
+    table = LensTable.from_columns(known)
+    if errors := table.calculate():
+        raise ValueError(next(iter(errors)))
+    return table
+
+
+class Distribution:
+    """
+    Distribution of the values of one variable.
+
+    The mean and the standard deviation are exact, the percentiles are
+    interpolated from a histogram with the `edges` of its bins, `counts`
+    are the numbers of the values in the bins, `below` and `above`
+    outside of them.
+    """
+
+    def __init__(self, edges):
+        self.edges = edges
+        self.counts = np.zeros(len(edges) - 1, dtype=np.int64)
+        self.below = self.above = self.count = 0
+        self.mean = self._squares = 0.0
+        self.minimum, self.maximum = np.inf, -np.inf
+
+    def add(self, values):
+        """
+        Add the `values` (an array) to the distribution.
+        """
+        if not len(values):
+            return
+        # The mean and the sum of the squares of the differences from it
+        # are merged with the ones of the values (Chan's formula).
+        count, mean = len(values), float(np.mean(values))
+        total = self.count + count
+        self._squares += float(np.sum((values - mean) ** 2)) + (mean - self.mean) ** 2 * self.count * count / total
+        self.mean += (mean - self.mean) * count / total
+        self.count = total
+        self.minimum = min(self.minimum, float(np.min(values)))
+        self.maximum = max(self.maximum, float(np.max(values)))
+
+        self.below += int(np.count_nonzero(values < self.edges[0]))
+        self.above += int(np.count_nonzero(values > self.edges[-1]))
+        self.counts += np.histogram(values, self.edges)[0]
+
+    def merge(self, other):
+        """
+        Add the values of the `other` distribution with the same bins.
+        """
+        total = self.count + other.count
+        if not other.count:
+            return
+        self._squares += other._squares + (other.mean - self.mean) ** 2 * self.count * other.count / total
+        self.mean += (other.mean - self.mean) * other.count / total
+        self.count = total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.below += other.below
+        self.above += other.above
+        self.counts += other.counts
+
+    @property
+    def std(self):
+        return (self._squares / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+
+    def percentile(self, percent):
+        """
+        Return the `percent` percentile of the values.
+        """
+        if not self.count:
+            return np.nan
+        rank = percent / 100 * self.count
+        if rank <= self.below:
+            return self.minimum
+        if rank >= self.count - self.above:
+            return self.maximum
+        # Linear interpolation in the bin with the rank.
+        cumulative = np.concatenate([[0], np.cumsum(self.counts)]) + self.below
+        return float(np.interp(rank, cumulative, self.edges))
+
+    def __repr__(self):
+        return f"Distribution(count={self.count}, mean={self.mean!r}, std={self.std!r})"
+
+
+def _sample(given, sigma, size, seed):
+    # Calculate the lenses with the values of the variables in `sigma`
+    # from the normal distribution.
+    random = np.random.default_rng(seed)
+    values = {**given, **{v: random.normal(given[v], deviation, size) for v, deviation in sigma.items()}}
+    return Lens.calculate_batch(values)
+
+
+def _distributions(results, size, edges):
+    # Distributions of the variables of one chunk of the calculated lenses
+    # and the number of the lenses which couldn't be calculated.
+    valid = np.all([np.isfinite(results[v]) for v in edges], axis=0)
+    distributions = {}
+    for variable, variable_edges in edges.items():
+        distributions[variable] = Distribution(variable_edges)
+        distributions[variable].add(results[variable][valid])
+    return distributions, size - int(np.count_nonzero(valid))
+
+
+def _tolerance_chunk(given, sigma, size, seed, edges):
+    return _distributions(_sample(given, sigma, size, seed), size, edges)
+
+
+def tolerance(base, sigma, samples=100_000, outputs=("EFL", "BFL", "FFL", "P1", "P2"), percentiles=(1, 5, 50, 95, 99), chunk_size=100_000, workers=1, bins=1000, seed=0):
+    """
+    Calculate the `base` lens (or a dictionary of the known variables)
+    with the given values changed randomly: `sigma` maps the variables
+    to the standard deviations of their normal distributions.
+
+    The lenses are calculated in chunks of `chunk_size`, so the memory
+    doesn't depend on the number of `samples`. With more `workers`
+    the chunks are calculated in more processes. The results
+    are the same for the same `seed` and `chunk_size`.
+
+    Return a dictionary with `Distribution` of each of the `outputs`,
+    the `percentiles` of each of them and the number of the lenses
+    which couldn't be calculated ("invalid").
+    """
+    given = {v: float(value) for v, value in given_values(base).items()}
+    if missing := set(sigma) - set(given):
+        raise ValueError(f"The varied variables have to be given: {', '.join(sorted(missing))}")
+    if given_outputs := set(outputs) & set(given):
+        raise ValueError(f"The outputs have to be calculated: {', '.join(sorted(given_outputs))}")
+    _check_known(given)
+
+    sizes = [min(chunk_size, samples - start) for start in range(0, samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    # The bins of the histograms are set by the first chunk, wide enough
+    # for the values of the other chunks.
+    first = _sample(given, sigma, sizes[0], seeds[0])
+    edges = {}
+    for variable in outputs:
+        values = first[variable][np.isfinite(first[variable])]
+        low, high = (np.min(values), np.max(values)) if len(values) else (0.0, 0.0)
+        spread = max(high - low, abs(high) * 1e-12, 1e-300)
+        edges[variable] = np.linspace(low - spread, high + spread, bins + 1)
+
+    # The first chunk is already calculated.
+    arguments = [(given, sigma, size, chunk_seed, edges) for size, chunk_seed in zip(sizes[1:], seeds[1:])]
+    executor = None
+    if workers > 1 and arguments:
+        executor = ProcessPoolExecutor(workers, initializer=warm_up, initargs=([signature(given)],))
+        chunks = executor.map(_tolerance_chunk, *zip(*arguments))
+    else:
+        chunks = (_tolerance_chunk(*chunk) for chunk in arguments)
+
+    distributions = {variable: Distribution(variable_edges) for variable, variable_edges in edges.items()}
+    invalid = 0
+    try:
+        for chunk, chunk_invalid in chain([_distributions(first, sizes[0], edges)], chunks):
+            for variable, distribution in chunk.items():
+                distributions[variable].merge(distribution)
+            invalid += chunk_invalid
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return {
+        "distributions": distributions,
+        "percentiles": {v: {p: distribution.percentile(p) for p in percentiles} for v, distribution in distributions.items()},
+        "invalid": invalid,
+    }
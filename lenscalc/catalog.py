@@ -0,0 +1,182 @@
+"""
+Catalog of lenses searchable by their variables.
+
+The chosen columns of the calculated lenses are split into small boxes
+(the leaves of a k-d tree) stored in plain NumPy arrays, so the catalog can be saved and loaded
+back as memory-mapped files without building the index again.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+
+from .table import LensTable
+
+# Arrays saved by `LensCatalog.save`.
+_ARRAYS = "values", "known", "points", "order", "starts", "ends", "lower", "upper"
+
+
+class LensCatalog:
+    """
+    Lenses from `LensTable` (or an iterable of lenses) indexed
+    by the `columns` (variables).
+
+    All the variables of the lenses are calculated when the catalog
+    is created. The distances are measured in the units of the variables
+    divided by their `scale` (a dictionary, 1 by default). The lenses
+    without some of the indexed values aren't found by the queries.
+    """
+
+    def __init__(self, lenses, columns=("EFL", "BFL", "CT"), scale=None, leaf_size=64):
+        table = lenses if isinstance(lenses, LensTable) else LensTable.from_lenses(lenses)
+        if unknown := set(columns) - set(table.variables):
+            raise ValueError(f"Unknown variables: {', '.join(sorted(unknown))}")
+        table.calculate()
+
+        self.table = table
+        self.columns = tuple(columns)
+        self.scale = np.array([(scale or {}).get(column, 1.0) for column in self.columns], dtype=float)
+        self.leaf_size = leaf_size
+        self._build()
+
+    def _build(self):
+        # The points are split in the middle of their widest dimension
+        # (as in a k-d tree) until there are at most `leaf_size` of them.
+        # The points of the leaf `i` are `points[starts[i]:ends[i]]`
+        # in the box from `lower[i]` to `upper[i]`.
+        points = np.column_stack([self.table[column] for column in self.columns]) / self.scale
+        order = np.flatnonzero(np.all(np.isfinite(points), axis=1))
+        points = points[order]
+
+        starts, ends, lower, upper = [], [], [], []
+        # The catalog without any indexed lenses has no leaves.
+        stack = [(0, len(order))] if len(order) else []
+        while stack:
+            start, end = stack.pop()
+            segment = points[start:end]
+            low, high = segment.min(axis=0), segment.max(axis=0)
+            if end - start <= self.leaf_size:
+                starts.append(start)
+                ends.append(end)
+                lower.append(low)
+                upper.append(high)
+                continue
+
+            middle = (end - start) // 2
+            partition = np.argpartition(segment[:, np.argmax(high - low)], middle)
+            points[start:end] = segment[partition]
+            order[start:end] = order[start:end][partition]
+            # The left half is split first, so the leaves are in the order of the points.
+            stack.append((start + middle, end))
+            stack.append((start, start + middle))
+
+        self.points = points
+        self.order = order
+        self.starts = np.array(starts, dtype=np.int64)
+        self.ends = np.array(ends, dtype=np.int64)
+        self.lower = np.array(lower, dtype=float).reshape(-1, len(self.columns))
+        self.upper = np.array(upper, dtype=float).reshape(-1, len(self.columns))
+
+    def __len__(self):
+        return len(self.table)
+
+    def _point(self, values):
+        if missing := set(self.columns) - set(values):
+            raise ValueError(f"Missing values of: {', '.join(sorted(missing))}")
+        return np.array([values[column] for column in self.columns], dtype=float) / self.scale
+
+    def _positions(self, leaves):
+        # Positions of the points of the `leaves` in `points`.
+        lengths = self.ends[leaves] - self.starts[leaves]
+        offsets = np.repeat(self.starts[leaves] - np.cumsum(lengths) + lengths, lengths)
+        return np.arange(lengths.sum()) + offsets
+
+    def nearest(self, values, k=1):
+        """
+        Find `k` lenses nearest to the `values` of the indexed columns
+        (a dictionary).
+
+        Return arrays with the indexes of the lenses in the table
+        and their distances, the nearest lens first.
+        """
+        point = self._point(values)
+        k = min(k, len(self.points))
+        if k < 1:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # The distance of the k-th nearest lens is at most the distance
+        # of the k-th lens in the nearest leaves, only the leaves
+        # nearer than that have to be searched.
+        gap = np.maximum(self.lower - point, 0) + np.maximum(point - self.upper, 0)
+        leaf_distances = np.sum(gap ** 2, axis=1)
+        nearest_leaves = [int(np.argmin(leaf_distances))]
+        if self.ends[nearest_leaves[0]] - self.starts[nearest_leaves[0]] < k:
+            nearest_leaves = np.argsort(leaf_distances)
+            count = np.searchsorted(np.cumsum(self.ends[nearest_leaves] - self.starts[nearest_leaves]), k) + 1
+            nearest_leaves = nearest_leaves[:count]
+        distances = np.sum((self.points[self._positions(nearest_leaves)] - point) ** 2, axis=1)
+        limit = np.partition(distances, k - 1)[k - 1]
+
+        positions = self._positions(np.flatnonzero(leaf_distances <= limit))
+        distances = np.sum((self.points[positions] - point) ** 2, axis=1)
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+        return self.order[positions[nearest]], np.sqrt(distances[nearest])
+
+    def within(self, ranges):
+        """
+        Find the lenses with the values of the indexed columns
+        in the `ranges` (a dictionary mapping the columns to pairs
+        (low, high), None for no limit).
+
+        Return a sorted array with the indexes of the lenses in the table.
+        """
+        if unknown := set(ranges) - set(self.columns):
+            raise ValueError(f"Not indexed variables: {', '.join(sorted(unknown))}")
+        low = np.full(len(self.columns), -np.inf)
+        high = np.full(len(self.columns), np.inf)
+        for column, (column_low, column_high) in ranges.items():
+            index = self.columns.index(column)
+            if column_low is not None:
+                low[index] = column_low / self.scale[index]
+            if column_high is not None:
+                high[index] = column_high / self.scale[index]
+
+        leaves = np.flatnonzero(np.all((self.lower <= high) & (self.upper >= low), axis=1))
+        positions = self._positions(leaves)
+        points = self.points[positions]
+        return np.sort(self.order[positions[np.all((points >= low) & (points <= high), axis=1)]])
+
+    def save(self, directory):
+        """
+        Save the catalog with its index to the `directory`.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = {"values": self.table.values, "known": self.table.known}
+        for name in _ARRAYS:
+            np.save(directory / f"{name}.npy", arrays[name] if name in arrays else getattr(self, name))
+        meta = {"columns": self.columns, "scale": self.scale.tolist(), "leaf_size": self.leaf_size}
+        (directory / "catalog.json").write_text(json.dumps(meta))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Load the catalog saved by `save`. With `mmap` the arrays
+        are memory-mapped (read-only) instead of being read.
+        """
+        directory = Path(directory)
+        meta = json.loads((directory / "catalog.json").read_text())
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode="r" if mmap else None) for name in _ARRAYS}
+
+        catalog = object.__new__(cls)
+        catalog.table = LensTable(arrays.pop("values"), arrays.pop("known"))
+        catalog.columns = tuple(meta["columns"])
+        catalog.scale = np.array(meta["scale"], dtype=float)
+        catalog.leaf_size = meta["leaf_size"]
+        for name, array in arrays.items():
+            setattr(catalog, name, array)
+        return catalog
+
+    def __repr__(self):
+        return f"<LensCatalog with {len(self)} lenses indexed by {', '.join(self.columns)}>"
@@ -0,0 +1,210 @@
+"""
+Command line interface of lenscalc.
+
+The lenses are read from a CSV or JSONL file (a column or a key
+for each known variable, the other columns are copied to the output)
+and all their variables are written to the output together with
+the error message for the lenses which can't be calculated.
+The files are processed in chunks, so they can be bigger than the memory.
+
+Usage:
+    $ python -m lenscalc solve input.csv -o output.csv [--workers 4]
+"""
+import argparse
+import csv
+import json
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+from math import ceil
+from pathlib import Path
+
+from .compact import CompactLens
+from .lens import Lens
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def solve_record(known):
+    """
+    Calculate the lens with the `known` variables.
+
+    Return a list with the values of all the variables (None for the values
+    which aren't real numbers) and the error message (empty if there isn't any).
+    """
+    lens = CompactLens(**known)
+    # The lenses which can't be determined aren't solved at all.
+    if known and Lens.structure(known).missing:
+        return [getattr(lens, v) for v in Lens.variables], "The known variables don't determine the lens!"
+    if len(known) < len(Lens.variables):
+        try:
+            results, _ = Lens._calculate(known, "symbolic")
+        except Exception as error:  # One lens mustn't stop the whole file.
+            return [getattr(lens, v) for v in Lens.variables], str(error) or type(error).__name__
+
+        # Results with symbols are only partial solutions.
+        if any(getattr(value, "free_symbols", None) for value in results.values()):
+            return [getattr(lens, v) for v in Lens.variables], "The known variables don't determine the lens!"
+
+        for variable, value in results.items():
+            setattr(lens, variable, value)
+
+    return [getattr(lens, v) for v in Lens.variables], ""
+
+
+def solve_records(records):
+    """
+    Calculate a list of lenses, see `solve_record`.
+    """
+    return [solve_record(known) for known in records]
+
+
+def parse(record):
+    """
+    Split the `record` into the extra values and the known variables.
+
+    Return them together with the error message
+    (None if the values are correct).
+    """
+    extra, known = {}, {}
+    for key, value in record.items():
+        if key == "error":
+            continue
+        if key not in Lens.variables:
+            extra[key] = value
+        elif value not in (None, ""):
+            try:
+                known[key] = float(value)
+            except (TypeError, ValueError) as error:
+                return extra, known, f"{key}: {error}"
+
+    return extra, known, None
+
+
+def solve_chunk(records, executor=None, workers=1):
+    """
+    Calculate the lenses in the `records` (dictionaries).
+
+    The lenses are grouped by their known variables, so that the solution
+    of the lens equations is reused and every worker needs only a few
+    of them. Yield triples (extra values, values of the variables, error)
+    in the order of the `records`.
+    """
+    parsed = [parse(record) for record in records]
+    groups = defaultdict(list)
+    for index, (_, known, error) in enumerate(parsed):
+        if error is None:
+            groups[frozenset(known)].append(index)
+
+    # The groups are split to use all the workers.
+    size = max(1, ceil(len(records) / workers))
+    parts = [indexes[start:start + size] for indexes in groups.values() for start in range(0, len(indexes), size)]
+    tasks = [[parsed[index][1] for index in part] for part in parts]
+    solved = executor.map(solve_records, tasks) if executor is not None else map(solve_records, tasks)
+
+    results = {}
+    for part, part_results in zip(parts, solved):
+        results.update(zip(part, part_results))
+
+    for index, (extra, known, error) in enumerate(parsed):
+        if error is not None:
+            values = [known.get(variable) for variable in Lens.variables]
+            yield extra, values, error
+        else:
+            yield (extra, *results[index])
+
+
+def read_records(file, format):
+    """
+    Yield the records (dictionaries) from the `file`.
+    """
+    if format == "csv":
+        yield from csv.DictReader(file)
+        return
+
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+class Writer:
+    """
+    Writer of the calculated lenses to a CSV or JSONL file.
+    """
+
+    def __init__(self, file, format):
+        self.file = file
+        self.format = format
+        self.csv = None
+
+    def write(self, extra, values, error):
+        if self.format == "jsonl":
+            record = {**extra, **dict(zip(Lens.variables, values)), "error": error}
+            self.file.write(json.dumps(record) + "\n")
+            return
+
+        if self.csv is None:
+            # The extra columns are taken from the first lens, the extra
+            # values of the other lenses are written by their names
+            # (the ones which aren't in the first lens are left out).
+            fieldnames = [*extra, *Lens.variables, "error"]
+            self.csv = csv.DictWriter(self.file, fieldnames, extrasaction="ignore")
+            self.csv.writeheader()
+        row = {**extra, **{v: "" if value is None else value for v, value in zip(Lens.variables, values)}, "error": error}
+        self.csv.writerow(row)
+
+
+def open_file(path, mode):
+    if path == "-":
+        return nullcontext(sys.stdin if mode == "r" else sys.stdout)
+    return open(path, mode, newline="")
+
+
+def file_format(path, default="csv"):
+    return FORMATS.get(Path(path).suffix.lower(), default)
+
+
+def solve(input, output="-", format=None, output_format=None, workers=1, chunk_size=1000):
+    """
+    Calculate the lenses from the `input` file and write them to `output`.
+
+    Return the number of lenses and the number of errors.
+    """
+    format = format or file_format(input)
+    output_format = output_format or file_format(output, format)
+
+    count = errors = 0
+    with open_file(input, "r") as input_file, open_file(output, "w") as output_file:
+        executor = ProcessPoolExecutor(workers) if workers > 1 else None
+        with executor or nullcontext():
+            writer = Writer(output_file, output_format)
+            records = read_records(input_file, format)
+            while chunk := list(islice(records, chunk_size)):
+                for extra, values, error in solve_chunk(chunk, executor, workers):
+                    writer.write(extra, values, error)
+                    count += 1
+                    errors += bool(error)
+
+    return count, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m lenscalc", description=__doc__.split("\n\n")[0].strip())
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_solve = subparsers.add_parser("solve", help="calculate the lenses from a file")
+    parser_solve.add_argument("input", help="CSV or JSONL file with the lenses (- for the standard input)")
+    parser_solve.add_argument("--output", "-o", default="-", help="file for the results (default: the standard output)")
+    parser_solve.add_argument("--format", choices=("csv", "jsonl"), help="format of the input (default: from the extension)")
+    parser_solve.add_argument("--output-format", choices=("csv", "jsonl"), help="format of the output (default: from the extension)")
+    parser_solve.add_argument("--workers", type=int, default=1, help="number of processes (default: 1)")
+    parser_solve.add_argument("--chunk-size", type=int, default=1000, help="number of lenses read at once (default: 1000)")
+    args = parser.parse_args(argv)
+
+    count, errors = solve(
+        args.input, args.output, args.format, args.output_format, args.workers, args.chunk_size,
+    )
+    print(f"{count} lenses calculated, {errors} errors", file=sys.stderr)
+    return 0
@@ -0,0 +1,110 @@
+"""
+Generate a module with solvers of the lens equations.
+
+For every combination of known variables the lens equations are solved
+once and the solution is written out as a function working with plain
+floats. `Lens.calculate` looks the solvers up by a bitmask of the known
+variables and uses SymPy only for the combinations that are missing.
+
+Usage:
+    $ python -m lenscalc.codegen [--max-known 6] [--output PATH]
+"""
+import argparse
+from itertools import combinations
+from pathlib import Path
+
+from sympy import cse, sympify
+from sympy.printing.pycode import pycode
+
+from .lens import Lens, _Plan
+
+DEFAULT_OUTPUT = Path(__file__).parent / "_solvers.py"
+
+HEADER = '''"""
+Solvers of the lens equations generated by `python -m lenscalc.codegen`.
+
+Don't edit this file, generate it again instead.
+"""
+import math
+'''
+
+
+def known_combinations(max_known):
+    """
+    Yield all combinations of known variables (up to `max_known` of them).
+
+    Each combination is yielded together with the information
+    whether NPS is zero, which is possible only if n1 and n2 are known.
+    """
+    for size in range(1, max_known + 1):
+        for known in combinations(Lens.variables, size):
+            yield frozenset(known), False
+            if "n1" in known and "n2" in known:
+                yield frozenset(known), True
+
+
+def function_source(name, plan):
+    """
+    Return source code of a function evaluating the plan.
+    """
+    expressions = [sympify(expression) for expression in plan.expressions.values()]
+    subexpressions, expressions = cse(expressions)
+
+    lines = [f"def {name}({', '.join(plan.inputs)}):"]
+    for symbol, subexpression in subexpressions:
+        lines.append(f"    {symbol} = {pycode(subexpression)}")
+    lines.append("    return (")
+    for expression in expressions:
+        lines.append(f"        {pycode(expression)},")
+    lines.append("    )")
+
+    return "\n".join(lines)
+
+
+def generate(output=DEFAULT_OUTPUT, max_known=6, known_sets=None):
+    """
+    Solve the lens equations and write the solvers to `output`.
+
+    `known_sets` can limit the generation to the given pairs
+    of known variables and NPS being zero (see `known_combinations`).
+    Return the number of written solvers.
+    """
+    if known_sets is None:
+        known_sets = known_combinations(max_known)
+
+    functions, solvers, errors = [], [], []
+    for known, nps_zero in known_sets:
+        plan = _Plan.compile(Lens, known, nps_zero)
+        if plan is None:
+            continue
+
+        mask = Lens._mask(known, nps_zero)
+        if plan.error is not None:
+            errors.append(f"    {mask}: {plan.error!r},")
+            continue
+
+        name = f"_solve_{mask}"
+        functions.append(function_source(name, plan))
+        solvers.append(f"    {mask}: ({plan.outputs!r}, {name}),")
+
+    source = [HEADER]
+    source.extend(f"\n{function}\n" for function in functions)
+    source.append("\nSOLVERS = {\n" + "".join(f"{line}\n" for line in solvers) + "}\n")
+    source.append("\nERRORS = {\n" + "".join(f"{line}\n" for line in errors) + "}\n")
+    Path(output).write_text("\n".join(source))
+
+    return len(solvers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m lenscalc.codegen", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--max-known", type=int, default=6, help="maximal number of known variables (default: 6)")
+    parser.add_argument("--output", "-o", type=Path, default=DEFAULT_OUTPUT, help="path of the generated module")
+    args = parser.parse_args(argv)
+
+    count = generate(args.output, args.max_known)
+    print(f"{count} solvers written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Lens storing its variables in a compact array of floats.
+"""
+from array import array
+from math import isnan, nan
+
+from . import profiling
+from .lens import Lens
+
+
+def _float(value):
+    # Values which aren't real numbers (e.g. complex infinity) are stored
+    # the same way as the missing ones.
+    if value is None:
+        return nan
+    try:
+        return float(value)
+    except TypeError:
+        return nan
+
+
+def _variable(index):
+    # Property accessing one variable in the array of values.
+    def get(self):
+        value = self._values[index]
+        return None if isnan(value) else float(value)
+
+    def set(self, value):
+        if isinstance(value, str):
+            value = float(value)
+        self._values[index] = _float(value)
+        # After the calculation the set values are given by the user.
+        if (given := self._given) is not None:
+            variable = self.variables[index]
+            self._given = given - {variable} if isnan(self._values[index]) else given | {variable}
+
+    return property(get, set)
+
+
+class CompactLens:
+    """
+    Lens with the variables stored as plain floats in one array.
+
+    It has no `__dict__` (extra attributes can't be set), missing values
+    are stored as NaN and the values are always converted to float,
+    so SymPy numbers aren't kept. Otherwise it is used the same way as `Lens`.
+    """
+
+    __slots__ = "_values", "convergence", "_given"
+
+    variables = Lens.variables
+
+    for index, variable in enumerate(variables):
+        vars()[variable] = _variable(index)
+    del index, variable
+
+    def __init__(self, **values):
+        if unknown := set(values) - set(self.variables):
+            raise TypeError(f"Unknown variables: {', '.join(sorted(unknown))}")
+
+        self._values = array("d", [nan]) * len(self.variables)
+        # The variables given before the calculation (None before it).
+        self._given = None
+        for variable, value in values.items():
+            setattr(self, variable, value)
+
+    @classmethod
+    def _from_values(cls, values):
+        # Lens using the given array (e.g. a row of a NumPy array)
+        # to store its values, the array isn't copied.
+        lens = object.__new__(cls)
+        lens._values = values
+        lens._given = None
+        return lens
+
+    @property
+    def replacements(self):
+        return {
+            variable: value
+            for variable, value in zip(self.variables, self._values)
+            if not isnan(value)
+        }
+
+    @property
+    def given(self):
+        """
+        The given (not calculated) values.
+        """
+        replacements = self.replacements
+        if self._given is None:
+            return replacements
+        return {variable: value for variable, value in replacements.items() if variable in self._given}
+
+    def calculate(self, method="symbolic", jacobian=False):
+        """
+        Calculate the missing variables, see `Lens.calculate`.
+        """
+        with profiling.measure() as timer:
+            replacements = self.replacements
+            if timer:
+                timer.lap("replacements")
+
+            results, convergence = Lens._calculate(replacements, method)
+            if convergence is not None:
+                self.convergence = convergence
+                if not convergence.converged:
+                    raise ValueError(f"The numeric solution didn't converge: {convergence}")
+
+            for variable, value in results.items():
+                self._values[self.variables.index(variable)] = _float(value)
+            if self._given is None:
+                self._given = frozenset(replacements)
+
+        if jacobian:
+            return Lens._jacobian(replacements)
+
+    def __copy__(self):
+        lens = self._from_values(array("d", self._values))
+        lens._given = self._given
+        if hasattr(self, "convergence"):
+            lens.convergence = self.convergence
+        return lens
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
+
+    def __str__(self):
+        return "\n".join(f"{var}: {getattr(self, var)}" for var in self.variables)
+
+    def __repr__(self):
+        return self.__str__()
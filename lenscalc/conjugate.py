@@ -0,0 +1,72 @@
+"""
+Conjugate planes of a lens: the image of an object in a given distance.
+
+The distances are positions on the optical axis (positive to the right,
+like `FFL` and `BFL`): the object distance `OD` is measured from the first
+vertex (negative for real objects), the image distance `ID` from the last
+vertex. `LM` is the lateral and `AM` the angular magnification.
+"""
+from functools import lru_cache
+
+from .graph import EquationGraph
+from .lens import Lens, _lazy
+
+# The conjugate variables in the order of their equations.
+CONJUGATE_VARIABLES = "ID", "LM", "AM"
+
+
+class ConjugateLens(Lens):
+    """
+    Lens with the variables of an object and its image.
+
+    It is calculated the same way as `Lens`, any set of the known variables
+    determining the lens and the object (e.g. the magnification and EFL)
+    can be given.
+    """
+
+    variables = Lens.variables + ("OD",) + CONJUGATE_VARIABLES
+
+    @_lazy
+    def equations(cls):
+        from sympy import Eq, symbols
+        n1, n2, D, P1, P2, OD, ID, LM, AM = symbols("n1 n2 D P1 P2 OD ID LM AM")
+        return Lens.equations + (
+            # The distances from the principal planes
+            # are (OD - P1) and (ID - P2).
+            Eq(n2 / (ID - P2) - n1 / (OD - P1), D),
+            Eq(LM, (n1 * (ID - P2)) / (n2 * (OD - P1))),
+            Eq(AM, n1 / (n2 * LM)),
+        )
+
+    @_lazy
+    def _graph(cls):
+        return EquationGraph(cls.variables, cls.equations)
+
+    # The solutions aren't shared with `Lens` and the generated solvers
+    # are only for `Lens`.
+    _plans = {}
+    _generated = False
+
+    # An object 100 mm in front of the lens from the README.
+    _seed = dict(Lens._seed, OD=-100, ID=80.1297702582778, LM=-0.801283279483747, AM=-1.24799808707388)
+
+    def __init__(self, *, OD=None, ID=None, LM=None, AM=None, **values):
+        super().__init__(**values)
+        self.OD, self.ID, self.LM, self.AM = OD, ID, LM, AM
+
+
+@lru_cache(maxsize=None)
+def image_function():
+    """
+    Return a function calculating the conjugate variables (`CONJUGATE_VARIABLES`)
+    from n1, n2, D, P1, P2 and OD (NumPy arrays).
+
+    The conjugate equations are solved one by one for the variables.
+    """
+    from sympy import Symbol, lambdify, solve
+
+    inputs = [Symbol(v) for v in ("n1", "n2", "D", "P1", "P2", "OD")]
+    solutions = {}
+    for equation, variable in zip(ConjugateLens.equations[len(Lens.equations):], CONJUGATE_VARIABLES):
+        solutions[Symbol(variable)] = solve(equation.subs(solutions), Symbol(variable))[0]
+    return lambdify(inputs, list(solutions.values()), modules="numpy")
@@ -0,0 +1,149 @@
+"""
+Catalog of glasses with the dispersion formulas of their refractive index.
+
+The catalog is loaded from a CSV file with the columns `name`, `formula`
+and the coefficients `k1`, `k2`, ... of the formula:
+
+- "sellmeier": n² = 1 + B1 λ² / (λ² - C1) + B2 λ² / (λ² - C2) + B3 λ² / (λ² - C3)
+  with the coefficients B1, B2, B3, C1, C2, C3 (the order used by Schott),
+- "cauchy": n = A + B / λ² + C / λ⁴ with the coefficients A, B, C.
+
+The wavelengths λ are in micrometers.
+
+    name,formula,k1,k2,k3,k4,k5,k6
+    N-BK7,sellmeier,1.03961212,0.231792344,1.01046945,0.00600069867,0.0200179144,103.560653
+"""
+import csv
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+# Number of the coefficients of the formulas.
+FORMULAS = {"sellmeier": 6, "cauchy": 3}
+
+
+def sellmeier(wavelengths, coefficients):
+    """
+    Return the refractive indexes for the `wavelengths` (an array)
+    of the glasses with the Sellmeier `coefficients` (a row for each glass).
+    """
+    b, c = coefficients[:, None, :3], coefficients[:, None, 3:]
+    squares = np.asarray(wavelengths, dtype=float)[None, :, None] ** 2
+    return np.sqrt(1 + np.sum(b * squares / (squares - c), axis=2))
+
+
+def cauchy(wavelengths, coefficients):
+    """
+    Return the refractive indexes for the `wavelengths` (an array)
+    of the glasses with the Cauchy `coefficients` (a row for each glass).
+    """
+    squares = np.asarray(wavelengths, dtype=float)[None, :] ** 2
+    a, b, c = coefficients[:, 0, None], coefficients[:, 1, None], coefficients[:, 2, None]
+    return a + b / squares + c / squares ** 2
+
+
+class Glass:
+    """
+    Glass from `GlassCatalog`, it can be used instead of a refractive
+    index in `Lens.calculate_spectrum`.
+    """
+
+    def __init__(self, name, formula, coefficients):
+        if formula not in FORMULAS:
+            raise ValueError(f"Unknown formula of {name}: {formula}")
+        if len(coefficients) != FORMULAS[formula]:
+            raise ValueError(f"The formula {formula} of {name} needs {FORMULAS[formula]} coefficients!")
+        self.name = name
+        self.formula = formula
+        self.coefficients = tuple(map(float, coefficients))
+
+    def index(self, wavelengths):
+        """
+        Return the refractive indexes for the `wavelengths` (in micrometers).
+        """
+        function = sellmeier if self.formula == "sellmeier" else cauchy
+        wavelengths = np.asarray(wavelengths, dtype=float)
+        return function(wavelengths.ravel(), np.array([self.coefficients]))[0].reshape(wavelengths.shape)
+
+    def __repr__(self):
+        return f"Glass({self.name!r}, {self.formula!r}, {self.coefficients!r})"
+
+
+class GlassCatalog:
+    """
+    Glasses by their names.
+
+    The refractive indexes of many glasses are evaluated at once
+    by `indexes`, the last `cache_size` results are cached.
+    """
+
+    def __init__(self, glasses=(), cache_size=128):
+        self.glasses = {glass.name: glass for glass in glasses}
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    @classmethod
+    def load(cls, path, cache_size=128):
+        """
+        Load the catalog from the CSV file (see the module).
+        """
+        glasses = []
+        with Path(path).open(newline="") as file:
+            for row in csv.DictReader(file):
+                formula = row["formula"].strip().lower()
+                coefficients = [row[f"k{number}"] for number in range(1, FORMULAS.get(formula, 0) + 1)]
+                glasses.append(Glass(row["name"].strip(), formula, coefficients))
+        return cls(glasses, cache_size)
+
+    def __getitem__(self, name):
+        return self.glasses[name]
+
+    def __contains__(self, name):
+        return name in self.glasses
+
+    def __iter__(self):
+        return iter(self.glasses.values())
+
+    def __len__(self):
+        return len(self.glasses)
+
+    @property
+    def names(self):
+        return list(self.glasses)
+
+    def indexes(self, names, wavelengths):
+        """
+        Return the refractive indexes of the glasses with the `names`
+        for the `wavelengths` (in micrometers), as an array
+        with a row for each glass.
+        """
+        names = tuple(names)
+        wavelengths = np.ravel(np.asarray(wavelengths, dtype=float))
+        key = names, wavelengths.tobytes()
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        result = np.empty((len(names), len(wavelengths)))
+        # The glasses with the same formula are evaluated together.
+        for formula, function in (("sellmeier", sellmeier), ("cauchy", cauchy)):
+            rows = [row for row, name in enumerate(names) if self.glasses[name].formula == formula]
+            if rows:
+                coefficients = np.array([self.glasses[names[row]].coefficients for row in rows])
+                result[rows] = function(wavelengths, coefficients)
+
+        result.flags.writeable = False
+        self._cache[key] = result
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def index(self, name, wavelengths):
+        """
+        Return the refractive indexes of the glass for the `wavelengths`.
+        """
+        return self.indexes([name], wavelengths)[0].reshape(np.shape(wavelengths))
+
+    def __repr__(self):
+        return f"<GlassCatalog with {len(self)} glasses>"
@@ -0,0 +1,219 @@
+"""
+Bipartite graph between the lens variables and the lens equations.
+"""
+from collections import namedtuple
+from functools import lru_cache
+from heapq import heappop, heappush
+
+Structure = namedtuple("Structure", ["status", "missing", "undetermined", "redundant"])
+Structure.__doc__ = """
+Structure of the equations with some known variables (see `EquationGraph.structure`):
+`status` is "determined", "under-determined" or "over-determined",
+`missing` is how many more variables have to be known,
+`undetermined` are the unknown variables which can't be calculated
+and `redundant` are the known variables in the equations with more
+known values than needed (the values have to be consistent).
+"""
+
+
+class EquationGraph:
+    """
+    Which variables appear in which equations.
+
+    The graph is built once for the lens equations and it is used to find
+    the order in which the equations can be solved.
+    """
+
+    def __init__(self, variables, equations):
+        self.variables = variables
+        self.equation_variables = tuple(
+            frozenset(str(symbol) for symbol in equation.free_symbols)
+            for equation in equations
+        )
+        self.variable_equations = {
+            variable: tuple(index for index, used in enumerate(self.equation_variables) if variable in used)
+            for variable in variables
+        }
+
+    def matching(self, equations, unknowns):
+        """
+        Find a maximum matching between the `equations` (their indexes)
+        and the `unknowns` (variables).
+
+        Return a dictionary mapping the matched variables to the equations.
+        """
+        matched = {}
+
+        def augment(equation, visited):
+            for variable in sorted(self.equation_variables[equation] & unknowns, key=self.variables.index):
+                if variable in visited:
+                    continue
+                visited.add(variable)
+                if variable not in matched or augment(matched[variable], visited):
+                    matched[variable] = equation
+                    return True
+            return False
+
+        for equation in equations:
+            augment(equation, set())
+
+        return matched
+
+    def blocks(self, equations, unknowns):
+        """
+        Split the system of `equations` in `unknowns` into the smallest
+        blocks which have to be solved simultaneously.
+
+        Return a list of pairs (equations, variables) in the order
+        in which the blocks can be solved (the variables of each block are
+        in the order of `variables`), or None if the equations
+        can't be solved for all the unknowns (there isn't one equation
+        for every variable).
+        """
+        matched = self.matching(equations, unknowns)
+        if len(equations) != len(unknowns) or len(matched) != len(unknowns):
+            return None
+        variable_of = {equation: variable for variable, equation in matched.items()}
+
+        # The equation depends on the equations which determine
+        # the other unknowns in it. Strongly connected components
+        # of these dependencies (Tarjan's algorithm) are the blocks,
+        # they are found in the order of the dependencies.
+        depends_on = {
+            equation: [matched[v] for v in self.equation_variables[equation] & unknowns if v != variable_of[equation]]
+            for equation in equations
+        }
+        index, lowlink, stack, on_stack, blocks = {}, {}, [], set(), []
+
+        def connect(equation):
+            index[equation] = lowlink[equation] = len(index)
+            stack.append(equation)
+            on_stack.add(equation)
+            for other in depends_on[equation]:
+                if other not in index:
+                    connect(other)
+                    lowlink[equation] = min(lowlink[equation], lowlink[other])
+                elif other in on_stack:
+                    lowlink[equation] = min(lowlink[equation], index[other])
+
+            if lowlink[equation] == index[equation]:
+                block = []
+                while (other := stack.pop()) != equation:
+                    on_stack.remove(other)
+                    block.append(other)
+                on_stack.remove(equation)
+                block.append(equation)
+                block.sort()
+                variables = sorted((variable_of[e] for e in block), key=self.variables.index)
+                blocks.append((tuple(block), variables))
+
+        for equation in equations:
+            if equation not in index:
+                connect(equation)
+
+        return blocks
+
+    @lru_cache(maxsize=None)
+    def dependencies(self, known):
+        """
+        Find from which variables the variables missing in `known`
+        (a frozenset) are calculated, in the same way as in `Lens._solve`.
+
+        Return a dictionary mapping the calculated variables to frozensets
+        of the variables used to calculate them. The variables which can't
+        be calculated depend on all the variables.
+        """
+        missing = set(self.variables) - known
+        result = {}
+        unknowns = [len(used & missing) for used in self.equation_variables]
+        ready = [index for index, count in enumerate(unknowns) if count == 1]
+        while missing and ready:
+            index = heappop(ready)
+            if unknowns[index] != 1:
+                continue
+
+            variable, = self.equation_variables[index] & missing
+            result[variable] = self.equation_variables[index] - {variable}
+            missing.remove(variable)
+            for other in self.variable_equations[variable]:
+                unknowns[other] -= 1
+                if unknowns[other] == 1:
+                    heappush(ready, other)
+
+        equations = [index for index, count in enumerate(unknowns) if count > 1][:len(missing)]
+        for block_equations, block_variables in self.blocks(equations, missing) or [(None, missing)]:
+            if block_equations is None:
+                used = frozenset(self.variables)
+            else:
+                used = frozenset().union(*(self.equation_variables[index] for index in block_equations))
+            for variable in block_variables:
+                result[variable] = used - {variable}
+
+        return result
+
+    @lru_cache(maxsize=None)
+    def structure(self, known):
+        """
+        Find whether the equations determine the variables missing
+        in `known` (a frozenset) only from the structure of the graph
+        (Dulmage–Mendelsohn decomposition), nothing is solved.
+
+        The unknowns which can be reached from an unmatched unknown
+        by alternating paths (any equation, then its matched variable)
+        are undetermined, the equations reached in the same way
+        from an unmatched equation are over-determined.
+        Return `Structure`.
+        """
+        unknowns = frozenset(self.variables) - known
+        equations = range(len(self.equation_variables))
+        matched = self.matching(equations, unknowns)
+        variable_of = {equation: variable for variable, equation in matched.items()}
+
+        undetermined = set(unknowns) - set(matched)
+        stack = list(undetermined)
+        while stack:
+            for equation in self.variable_equations[stack.pop()]:
+                variable = variable_of.get(equation)
+                if variable is not None and variable not in undetermined:
+                    undetermined.add(variable)
+                    stack.append(variable)
+
+        overdetermined = set(equations) - set(variable_of)
+        stack = list(overdetermined)
+        while stack:
+            for variable in self.equation_variables[stack.pop()] & unknowns:
+                equation = matched[variable]
+                if equation not in overdetermined:
+                    overdetermined.add(equation)
+                    stack.append(equation)
+
+        missing = len(unknowns) - len(matched)
+        redundant = frozenset().union(*(self.equation_variables[e] for e in overdetermined)) & known
+        if missing:
+            status = "under-determined"
+        elif overdetermined:
+            status = "over-determined"
+        else:
+            status = "determined"
+        return Structure(
+            status,
+            missing,
+            tuple(v for v in self.variables if v in undetermined),
+            tuple(v for v in self.variables if v in redundant),
+        )
+
+    @staticmethod
+    def affected(dependencies, changed):
+        """
+        Return the variables from `dependencies` (see `dependencies`)
+        which are calculated from the `changed` variables,
+        directly or through other calculated variables.
+        """
+        affected = set()
+        changed = set(changed)
+        while changed:
+            new = {variable for variable, used in dependencies.items() if used & changed} - affected
+            affected |= new
+            changed = new
+
+        return affected
@@ -0,0 +1,643 @@
+from math import isclose  # Due to the floating point inaccuracy
+from decimal import Decimal
+from heapq import heappop, heappush
+
+from . import profiling
+from .graph import EquationGraph
+
+try:
+    from ._solvers import SOLVERS, ERRORS
+except ImportError:  # The solvers haven't been generated, see `lenscalc.codegen`.
+    SOLVERS, ERRORS = {}, {}
+
+# The error of the combinations of variables which can't be calculated.
+CALCULATION_ERROR = (
+    "There has been a problem with the calculation.\n"
+    "If you think, that this should return a propper result,"
+    "don't hesitate to open an issue at "
+    "https://github.com/adelpopelkova/lenscalc/"
+)
+
+# SymPy and NumPy take a long time to import, so they are imported only
+# when they are needed. Plain numbers are calculated by the generated
+# solvers (see `_plan`) without importing any of them.
+
+
+class _lazy:
+    """
+    Class attribute computed when it is used for the first time.
+    """
+
+    def __init__(self, function):
+        self.function = function
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        value = self.function(owner)
+        setattr(owner, self.name, value)
+        return value
+
+
+class Lens:
+    variables = "D1", "D2", "D", "n1", "nL", "n2", "r1", "r2", "CT", "P1", "P2", "f1", "f2", "EFL", "FFL", "BFL", "NPS"
+
+    @_lazy
+    def numbers(cls):
+        # Classes with numbers
+        from sympy.core.numbers import Float, Rational, Zero, Infinity
+        return int, float, Float, Rational, Decimal, Zero, Infinity
+
+    @_lazy
+    def equations(cls):
+        from sympy import Eq, symbols
+        D1, D2, D, n1, nL, n2, r1, r2, CT, P1, P2, f1, f2, EFL, FFL, BFL, NPS = symbols(cls.variables)
+        return (
+            Eq(D1, (nL - n1) / r1),
+            Eq(D2, (n2 - nL) / r2),
+            Eq(D, D1 + D2 - D1 * D2 * (CT / nL)),
+            Eq(P1, (D2 / D) * (n1 / nL) * CT),
+            Eq(P2, -(D1 / D) * (n2 / nL) * CT),
+            Eq(EFL, 1 / D),
+            Eq(f1, -n1 * EFL),
+            Eq(f2, n2 * EFL),
+            Eq(BFL, f2 + P2),
+            Eq(FFL, f1 + P1),
+            Eq(NPS, f2 + f1),
+        )
+
+    # Which variables are in which equations, see `_solve`.
+    @_lazy
+    def _graph(cls):
+        return EquationGraph(cls.variables, cls.equations)
+
+    # Compiled solutions for the sets of known variables, see `_plan`,
+    # and whether the generated ones (`SOLVERS`) are for these equations.
+    _plans = {}
+    _generated = True
+
+    # Variables calculated by `calculate` mapped to the known variables
+    # of their calculation (None before the first calculation), the variables
+    # given by the user since the calculation and the given variables
+    # used for the calculation, see `_known_values`.
+    _calculated = None
+    _changed = frozenset()
+    _given = None
+
+    # The lens from the README, the numeric solution starts from it.
+    _seed = dict(
+        D1=0.009994, D2=0.0124925, D=0.02223679991, n1=1.0003, nL=1.5, n2=1.0003,
+        r1=50, r2=-40, CT=3, P1=1.12392500724714, P2=-0.899140005797714,
+        f1=-44.9839906842963, f2=44.9839906842963, EFL=44.9704995344359,
+        FFL=-43.8600656770491, BFL=44.0848506784985, NPS=0,
+    )
+
+    def __init__(self, *, D1=None, D2=None, D=None, n1=None, nL=None, n2=None, r1=None, r2=None, CT=None, P1=None, P2=None, f1=None, f2=None, EFL=None, FFL=None, BFL=None, NPS=None):
+        for variable, value in locals().items():
+            if variable in self.variables:
+                setattr(self, variable, value)
+
+    def __setattr__(self, name, value):
+        if name in self.variables:
+            if isinstance(value, str):
+                value = float(value)
+            # The value is given by the user now, the values calculated
+            # from it have to be calculated again.
+            if self._calculated is not None:
+                object.__setattr__(self, "_changed", self._changed | {name})
+                if name in self._calculated:
+                    object.__setattr__(self, "_calculated", {v: k for v, k in self._calculated.items() if v != name})
+        object.__setattr__(self, name, value)
+
+    def _known_values(self):
+        # The given values and the calculated values which don't depend
+        # on the values changed since the last calculation.
+        values = self._calculate_replacements()
+        if self._calculated is None or not self._changed:
+            return values
+
+        given = frozenset(v for v in values if v not in self._calculated)
+        # Plain numbers are calculated again from the given values,
+        # the plan for them is already compiled.
+        if given == self._given and all(isinstance(values[v], (int, float)) for v in given):
+            return {v: values[v] for v in given}
+        # A calculated value given without removing a given one
+        # would be inconsistent with the values it isn't calculated from.
+        if given != self._given and (structure := self._graph.structure(given)).status == "over-determined":
+            raise ValueError(
+                "The given variables over-determine the lens, "
+                f"remove one of: {', '.join(structure.redundant)}"
+            )
+
+        everything = frozenset(self.variables)
+        dependencies = {
+            variable: self._graph.dependencies(known).get(variable, everything)
+            for variable, known in self._calculated.items()
+        }
+        affected = self._graph.affected(dependencies, self._changed)
+        return {v: value for v, value in values.items() if v not in affected}
+
+    def _calculate_replacements(self):
+        result = {}
+        for variable in self.variables:
+            if (value := getattr(self, variable)) is not None:
+                result[variable] = value
+
+        return result
+
+    @classmethod
+    def _nps_zero(cls, values):
+        # From the equations:
+        # f1 = -n1 * EFL
+        # f2 = n2 * EFL
+        # NPS = f2 + f1
+        # NPS = (n2 * EFL) + (-n1 * EFL)
+        # NPS = EFL * (n2 - n1)
+        # and if n1 == n2 -> n2 - n1 = 0
+        # which means that NPS = EFL * 0
+        # which means that NPS = 0
+        n1, n2 = values.get("n1"), values.get("n2")
+        return bool(
+            n1 and n2
+            and all(isinstance(n, (int, float)) or isinstance(n, cls.numbers) for n in (n1, n2))
+            and isclose(n1, n2)
+        )
+
+    @classmethod
+    def structure(cls, known):
+        """
+        Find whether the `known` variables (their names or a dictionary
+        with their values) determine the lens, without solving anything.
+
+        Return `graph.Structure` with the status "determined",
+        "under-determined" (`missing` more variables from `undetermined`
+        have to be given) or "over-determined" (the values of the
+        `redundant` variables have to be consistent). Only the structure
+        of the equations is checked, so the values which make the equations
+        singular (e.g. the same n1 and nL) aren't found.
+        """
+        return cls._graph.structure(frozenset(known))
+
+    @classmethod
+    def _mask(cls, known, nps_zero):
+        # Bit for each known variable and one more bit for NPS being zero.
+        mask = sum(1 << index for index, variable in enumerate(cls.variables) if variable in known)
+        return mask | (nps_zero << len(cls.variables))
+
+    @classmethod
+    def _plan(cls, known, nps_zero):
+        key = known, nps_zero
+        # The symbolic solution depends only on which variables are known,
+        # so it is computed once and reused for all the following lenses.
+        if key not in cls._plans:
+            mask = cls._mask(known, nps_zero)
+            inputs = tuple(v for v in cls.variables if v in known)
+            if cls._generated and mask in SOLVERS:
+                outputs, function = SOLVERS[mask]
+                cls._plans[key] = _Plan(inputs, outputs, function)
+            elif cls._generated and mask in ERRORS:
+                cls._plans[key] = _Plan(inputs, (), error=ERRORS[mask])
+            else:
+                # The solution of the equations while compiling
+                # isn't measured as the solution of the lens.
+                with profiling.suspend():
+                    cls._plans[key] = _Plan.compile(cls, known, nps_zero)
+        return cls._plans[key]
+
+    def calculate(self, method="symbolic", jacobian=False):
+        """
+        Calculate the missing variables.
+
+        With `method="numeric"` the equations are solved numerically,
+        the diagnostics of the solution are saved as `convergence`.
+        With `jacobian=True` return the partial derivatives of the calculated
+        variables with respect to the given ones (see `_jacobian`).
+        """
+        with profiling.measure() as timer:
+            self.replacements = self._known_values()
+            if timer:
+                timer.lap("replacements")
+
+            # After the first calculation only the values affected
+            # by the changes are calculated.
+            if self._calculated is not None and len(self.replacements) == len(self.variables):
+                results, convergence = {}, None
+            else:
+                results, convergence = self._calculate(self.replacements, method)
+            if convergence is not None:
+                self.convergence = convergence
+                if not convergence.converged:
+                    raise ValueError(f"The numeric solution didn't converge: {convergence}")
+
+            # Remember from which values the results were calculated.
+            previous, known = self._calculated or {}, frozenset(self.replacements)
+            object.__setattr__(self, "_given", frozenset(v for v in known if v not in previous))
+            object.__setattr__(self, "_calculated", {
+                **{v: k for v, k in previous.items() if v in known},
+                **dict.fromkeys(results, known),
+            })
+            object.__setattr__(self, "_changed", frozenset())
+
+            self.replacements.update(results)
+            for variable, value in results.items():
+                object.__setattr__(self, variable, value)
+
+        if jacobian:
+            calculated = self._calculated
+            return self._jacobian({v: value for v, value in self.replacements.items() if v not in calculated})
+
+    @classmethod
+    def _jacobian(cls, given):
+        # Derivatives of the calculated variables with respect
+        # to the `given` ones, as a dictionary of dictionaries
+        # (e.g. `jacobian["EFL"]["r1"]`), see `_Plan.derivatives`.
+        # The solution with NPS set to zero doesn't have its derivatives
+        # with respect to n1 and n2, so the general one is preferred.
+        known = frozenset(given)
+        nps_zero = False
+        plan = cls._plan(known, nps_zero)
+        if (plan is None or plan.error is not None) and cls._nps_zero(given):
+            nps_zero = True
+            plan = cls._plan(known, nps_zero)
+        if plan is None:
+            raise ValueError("The known variables don't determine the lens!")
+        if plan.expressions is None:
+            # Generated solvers don't have the symbolic solution.
+            plan = cls._plans[known, nps_zero] = _Plan.compile(cls, known, nps_zero)
+        return plan.derivatives(given)
+
+    @classmethod
+    def _calculate(cls, replacements, method):
+        # Return the calculated variables and the diagnostics
+        # of the numeric solution (None for the symbolic one).
+        if method not in ("symbolic", "numeric"):
+            raise ValueError(f"Unknown method: {method}")
+
+        # Calculation without any variables isn't supported
+        # because `sympy.solve` gets into an infinite loop.
+        if not replacements:
+            raise ValueError("No variables were given!")
+
+        if len(replacements) == len(cls.variables):
+            print("Nothing to compute. All variables have their values!")
+            return {}, None
+
+        timer = profiling.current()
+        if method == "numeric":
+            from .numeric import solve_numeric
+            results = solve_numeric(cls, replacements)
+            if timer:
+                timer.path = "numeric"
+                timer.lap("numeric")
+            return results
+
+        results = None
+        # Plain numbers can be evaluated by the compiled plan.
+        # Everything else (SymPy numbers, Decimal, ...) is solved by SymPy
+        # to keep the type of the result.
+        if all(isinstance(value, (int, float)) for value in replacements.values()):
+            nps_zero = cls._nps_zero(replacements)
+            plan = cls._plan(frozenset(replacements), nps_zero)
+            if timer:
+                timer.lap("plan")
+            if plan is not None:
+                results = plan(replacements)
+                if timer:
+                    timer.path = "plan"
+                    timer.lap("evaluate_plan")
+            # When n1 and n2 were calculated and they are the same,
+            # NPS has to be handled separately by the symbolic solution.
+            if results is not None and not nps_zero and cls._nps_zero({**replacements, **results}):
+                results = None
+
+        if results is None:
+            if timer:
+                timer.path = "symbolic"
+            results = cls._solve(dict(replacements))
+
+        return results, None
+
+    @classmethod
+    def _solve_equation(cls, equation, variable, replacements):
+        from sympy import Symbol, solve
+        solved_equation = solve(equation, Symbol(variable))
+
+        if isinstance(solved_equation, list):
+            solved_equation = solved_equation[0]
+
+        if isinstance(solved_equation, dict):
+            solved_equation = solved_equation[Symbol(variable)]
+
+        if timer := profiling.current():
+            timer.single += 1
+            timer.lap("solve")
+            value = solved_equation.subs(replacements)
+            timer.lap("subs")
+            return value
+
+        return solved_equation.subs(replacements)
+
+    @classmethod
+    def _solve(cls, replacements, nps_zero=None):
+        from sympy import Float, Symbol, nan, solve
+        given = frozenset(replacements)
+        results = {}
+        missing = {v for v in cls.variables if v not in replacements}
+        graph = cls._graph
+
+        # Number of unknown variables in each equation.
+        # The equations with only one unknown are solved one by one
+        # (in the order in which they are defined), solving them
+        # can leave only one unknown in other equations using the variable.
+        unknowns = [len(variables & missing) for variables in graph.equation_variables]
+        ready = [index for index, count in enumerate(unknowns) if count == 1]
+        while missing and ready:
+            index = heappop(ready)
+            # The unknown could have been solved by another equation.
+            if unknowns[index] != 1:
+                continue
+
+            variable, = graph.equation_variables[index] & missing
+            results[variable] = replacements[variable] = cls._solve_equation(cls.equations[index], variable, replacements)
+            missing.remove(variable)
+            for other in graph.variable_equations[variable]:
+                unknowns[other] -= 1
+                if unknowns[other] == 1:
+                    heappush(ready, other)
+
+        if nps_zero is None:
+            nps_zero = cls._nps_zero(replacements)
+        if nps_zero:
+            results["NPS"] = 0
+            replacements["NPS"] = 0
+            missing.discard("NPS")
+
+        if not missing:
+            return results
+
+        # The rest of the equations have to be solved simultaneously.
+        # If possible, they are split into the smallest blocks of equations
+        # which have to be solved together.
+        missing_values = [v for v in cls.variables if v in missing]
+        equations = [index for index, count in enumerate(unknowns) if count > 1][:len(missing_values)]
+        blocks = graph.blocks(equations, missing) or [(equations, missing_values)]
+
+        for block_equations, block_variables in blocks:
+            if len(block_equations) == 1:
+                variable, = block_variables
+                results[variable] = replacements[variable] = cls._solve_equation(cls.equations[block_equations[0]], variable, replacements)
+                continue
+
+            solved_equations = solve([cls.equations[index] for index in block_equations], block_variables)
+            if timer := profiling.current():
+                timer.simultaneous += len(block_equations)
+                timer.lap("solve_simultaneous")
+
+            if isinstance(solved_equations, dict):
+                if len(solved_equations) < len(block_variables):
+                    solved_equations[Symbol("NPS")] = Symbol("NPS")
+                for variable in block_variables:
+                    results[variable] = replacements[variable] = solved_equations[Symbol(variable)].subs(replacements)
+                if timer:
+                    timer.lap("subs")
+                continue
+
+            if not len(solved_equations):
+                raise ValueError(CALCULATION_ERROR)
+
+            for variable, solved_equation in zip(block_variables, solved_equations[0]):
+                value = solved_equation.subs(replacements)
+                if timer:
+                    timer.lap("subs")
+                # The type of some values is sympy.core.add.Add
+                # or sympy.core.mul.Mul, the value isn't a number.
+                # This makes sure that we get the result as a number.
+                if not isinstance(value, Float):
+                    value = value.n()
+                    if timer:
+                        timer.lap("evaluate")
+                results[variable] = replacements[variable] = value
+
+        if cls._nps_zero(replacements):
+            results["NPS"] = 0
+
+        # A degenerate solution (e.g. 0 / 0 for n1 equal to n2) isn't
+        # a solution of the lens determined by the given values
+        # (the partial solutions of the other lenses are kept).
+        if any(value is nan or value != value for value in results.values()):
+            if not cls._graph.structure(given).missing:
+                raise ValueError(CALCULATION_ERROR)
+
+        return results
+
+    @classmethod
+    def calculate_batch(cls, known):
+        """
+        Calculate many lenses with the same known variables at once.
+
+        `known` maps the known variables to arrays (or single numbers)
+        of their values. Return a dictionary with arrays of all variables.
+        """
+        import numpy as np
+
+        if not known:
+            raise ValueError("No variables were given!")
+        if unknown := set(known) - set(cls.variables):
+            raise ValueError(f"Unknown variables: {', '.join(sorted(unknown))}")
+
+        columns = dict(zip(known, np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in known.values()))))
+        shape = next(iter(columns.values())).shape
+        results = {v: np.array(columns[v]) if v in columns else np.full(shape, np.nan) for v in cls.variables}
+
+        # NPS is zero for the lenses with the same n1 and n2 (see `_nps_zero`),
+        # these lenses have their own plan.
+        nps_zero = np.zeros(shape, dtype=bool)
+        if "n1" in columns and "n2" in columns:
+            n1, n2 = columns["n1"], columns["n2"]
+            nps_zero = (n1 != 0) & (n2 != 0) & np.isclose(n1, n2, rtol=1e-09, atol=0)
+
+        for flag in (False, True):
+            rows = nps_zero == flag
+            if not rows.any():
+                continue
+
+            key = frozenset(known), flag
+            plan = cls._plan(*key)
+            if plan is None:
+                raise ValueError("The known variables don't determine the lens!")
+            if plan.error is not None:
+                raise ValueError(plan.error)
+            if plan.expressions is None:
+                # Generated solvers work only with floats.
+                plan = cls._plans[key] = _Plan.compile(cls, *key)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = plan.vectorized(*(columns[v][rows] for v in plan.inputs))
+            for variable, value in zip(plan.outputs, values):
+                results[variable][rows] = value
+
+        return results
+
+    def image(self, object_distances):
+        """
+        Calculate the images of objects in the `object_distances`
+        (an array of distances from the first vertex, negative for real objects)
+        from the cardinal points of the lens, which is calculated if needed.
+
+        Return a dictionary with arrays of the conjugate variables
+        (see `lenscalc.conjugate`): OD, ID, LM and AM.
+        """
+        import numpy as np
+        from .conjugate import image_function
+
+        # The cardinal points are calculated again after a change
+        # of the given values (or for the first time, unless all the values are given).
+        missing = any(getattr(self, v) is None for v in ("n1", "n2", "D", "P1", "P2"))
+        uncalculated = self._calculated is None and len(self._calculate_replacements()) < len(self.variables)
+        if missing or uncalculated or self._changed:
+            self.calculate()
+
+        distances = np.asarray(object_distances, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = image_function()(*(float(getattr(self, v)) for v in ("n1", "n2", "D", "P1", "P2")), distances)
+        return {"OD": distances, **{v: np.broadcast_to(value, distances.shape) for v, value in zip(("ID", "LM", "AM"), values)}}
+
+    def calculate_spectrum(self, wavelengths, **indexes):
+        """
+        Calculate the lens for more wavelengths at once.
+
+        The refractive indexes (n1, nL, n2) are given as glasses
+        (`lenscalc.glass.Glass`) evaluated for the `wavelengths`
+        (in micrometers) or as arrays (e.g. `GlassCatalog.indexes`
+        with a row for each glass), the indexes which aren't given
+        are the same for all the wavelengths. The other given values
+        of the lens are used. Return a dictionary with arrays
+        of all variables (see `calculate_batch`).
+        """
+        import numpy as np
+
+        from .glass import Glass
+
+        if unknown := set(indexes) - {"n1", "nL", "n2"}:
+            raise ValueError(f"Only refractive indexes can be given, not: {', '.join(sorted(unknown))}")
+
+        calculated = self._calculated or {}
+        known = {
+            variable: np.asarray(value, dtype=float)
+            for variable, value in self._calculate_replacements().items()
+            if variable not in calculated
+        }
+        for variable, index in indexes.items():
+            known[variable] = index.index(wavelengths) if isinstance(index, Glass) else np.asarray(index, dtype=float)
+
+        shape = np.broadcast_shapes(np.shape(wavelengths), *(value.shape for value in known.values()))
+        return self.calculate_batch({variable: np.broadcast_to(value, shape) for variable, value in known.items()})
+
+    def __str__(self):
+        return "\n".join(f"{var}: {getattr(self, var)}" for var in self.variables)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class _Plan:
+    """
+    Compiled solution of the lens equations for one set of known variables.
+
+    The solution is found symbolically (with the known variables
+    as symbols) and turned into a plain Python function with `lambdify`.
+    """
+
+    def __init__(self, inputs, outputs, function=None, error=None, expressions=None):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.function = function
+        self.error = error
+        # The symbolic solution, it isn't available for generated solvers.
+        self.expressions = expressions
+        self._vectorized = self._derivatives = None
+
+    @classmethod
+    def compile(cls, lens_class, known, nps_zero):
+        """
+        Solve the lens equations for the `known` variables.
+
+        Return None if the result can't be expressed
+        only by the known variables.
+        """
+        from sympy import Basic, Symbol, lambdify
+
+        inputs = tuple(v for v in lens_class.variables if v in known)
+        # The equations can't determine all the unknowns
+        # without a matching equation for each of them.
+        if lens_class._graph.structure(frozenset(known)).missing:
+            return None
+
+        try:
+            expressions = lens_class._solve({v: Symbol(v) for v in inputs}, nps_zero)
+        except ValueError as error:
+            return cls(inputs, (), error=str(error))
+
+        for expression in expressions.values():
+            if isinstance(expression, Basic) and not expression.free_symbols <= set(map(Symbol, inputs)):
+                return None
+
+        function = lambdify([Symbol(v) for v in inputs], list(expressions.values()), modules="math")
+        return cls(inputs, tuple(expressions), function, expressions=expressions)
+
+    @property
+    def vectorized(self):
+        """
+        Function evaluating the plan for NumPy arrays of the known variables.
+        """
+        if self._vectorized is None:
+            from sympy import Symbol, lambdify
+            self._vectorized = lambdify([Symbol(v) for v in self.inputs], list(self.expressions.values()), modules="numpy")
+        return self._vectorized
+
+    def derivatives(self, replacements):
+        """
+        Evaluate the derivatives of the outputs with respect to the known
+        variables for their given values.
+
+        The derivatives are derived from the symbolic solution
+        when they are needed for the first time.
+        """
+        if self.error is not None:
+            raise ValueError(self.error)
+
+        if self._derivatives is None:
+            from sympy import Matrix, Symbol, lambdify
+            symbols = [Symbol(v) for v in self.inputs]
+            matrix = Matrix(list(self.expressions.values())).jacobian(symbols)
+            self._derivatives = lambdify(symbols, list(matrix), modules="math")
+
+        try:
+            values = list(map(float, self._derivatives(*(float(replacements[v]) for v in self.inputs))))
+        except (ArithmeticError, TypeError, ValueError):
+            raise ValueError("The derivatives can't be evaluated for these values!") from None
+        size = len(self.inputs)
+        return {
+            output: dict(zip(self.inputs, values[index * size:(index + 1) * size]))
+            for index, output in enumerate(self.outputs)
+        }
+
+    def __call__(self, replacements):
+        """
+        Evaluate the plan for the given values of the known variables.
+
+        Return None if the values can't be evaluated as real numbers
+        (e.g. division by zero), in that case SymPy has to be used.
+        """
+        if self.error is not None:
+            raise ValueError(self.error)
+
+        try:
+            values = list(map(float, self.function(*(replacements[v] for v in self.inputs))))
+        except (ArithmeticError, TypeError, ValueError):
+            return None
+        # NaN is from a degenerate solution, which SymPy checks.
+        if any(value != value for value in values):
+            return None
+        return dict(zip(self.outputs, values))
@@ -0,0 +1,190 @@
+"""
+Numeric solution of the lens equations.
+
+The equations with only one unknown are solved one by one using their
+solutions derived once with SymPy. The rest of the equations is solved
+with the Levenberg-Marquardt method (damped Newton's method),
+the residuals and the Jacobian are derived once from the lens equations
+and evaluated with NumPy.
+"""
+from collections import namedtuple
+from functools import lru_cache
+from heapq import heappop, heappush
+
+import numpy as np
+from sympy import Matrix, lambdify
+from sympy.core.symbol import Symbol
+from sympy.solvers import solve
+
+Convergence = namedtuple("Convergence", ["converged", "iterations", "residual", "rank"])
+Convergence.__doc__ = """
+Diagnostics of the numeric solution.
+
+`residual` is the largest residual of the equations relative to the size
+of their sides and `rank` is the rank of the Jacobian (with the equations
+and the unknowns scaled the same way), if it is lower than the number
+of unknowns, the solution isn't unique.
+"""
+
+
+@lru_cache(maxsize=None)
+def compile_equations(variables, equations):
+    """
+    Return functions evaluating the residuals of the `equations`,
+    their Jacobian with respect to all the `variables`
+    and the sizes of the sides of the equations.
+
+    The functions take an array with the values of all the variables.
+    """
+    symbols = [Symbol(v) for v in variables]
+    residuals = Matrix([equation.lhs - equation.rhs for equation in equations])
+
+    return (
+        lambdify([symbols], list(residuals), modules="numpy"),
+        lambdify([symbols], residuals.jacobian(symbols), modules="numpy"),
+        lambdify([symbols], [abs(equation.lhs) + abs(equation.rhs) for equation in equations], modules="numpy"),
+    )
+
+
+@lru_cache(maxsize=None)
+def compile_solution(variables, equation, variable):
+    """
+    Return a function evaluating the `variable` from the `equation`.
+
+    The function takes an array with the values of all the variables.
+    """
+    solution = solve(equation, Symbol(variable))[0]
+    return lambdify([[Symbol(v) for v in variables]], solution, modules="numpy")
+
+
+def weights(sizes):
+    """
+    Return the weights of the equations with the `sizes` of their sides,
+    so that the residuals don't depend on the units of the variables.
+    The equations with both sides zero aren't weighted.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = 1 / np.array(sizes, dtype=float)
+    result[~np.isfinite(result)] = 1
+    return result
+
+
+def levenberg_marquardt(values, rows, columns, functions, tolerance, max_iterations):
+    """
+    Solve the equations `rows` (indexes) for the variables `columns`
+    (indexes), starting from `values`, which are updated in place.
+
+    Return the number of iterations.
+    """
+    residuals, jacobian, sizes = functions
+
+    # The equations are weighted by the size of their sides at the start,
+    # otherwise the equations with large values (focal lengths) would be
+    # preferred over the ones with small values (powers).
+    row_weights = weights(sizes(values))[rows]
+
+    def evaluate(values):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return row_weights * np.array(residuals(values), dtype=float)[rows]
+
+    def relative_residual(values, residual):
+        # The weights at the start can be far from the size of the solution.
+        return np.max(np.abs(weights(sizes(values))[rows] * residual / row_weights))
+
+    current = evaluate(values)
+    damping = 1e-3
+    iterations = 0
+    while iterations < max_iterations and np.all(np.isfinite(current)) and relative_residual(values, current) > tolerance:
+        iterations += 1
+        matrix = row_weights[:, None] * np.array(jacobian(values), dtype=float)[rows][:, columns]
+        # The step is found as a least squares solution of the linearized
+        # equations together with the damping (scaled by the size of the
+        # columns of the Jacobian), without forming the normal equations.
+        scale = np.diag(np.linalg.norm(matrix, axis=0) + 1e-12)
+
+        # Increase the damping until the step decreases the residuals.
+        while damping < 1e10:
+            system = np.vstack([matrix, np.sqrt(damping) * scale])
+            right_side = np.concatenate([-current, np.zeros(len(columns))])
+            step = np.linalg.lstsq(system, right_side, rcond=None)[0]
+            candidate = values.copy()
+            candidate[columns] += step
+            residual = evaluate(candidate)
+            if np.all(np.isfinite(residual)) and residual @ residual < current @ current:
+                values[:] = candidate
+                current = residual
+                damping = max(damping / 10, 1e-12)
+                break
+            damping *= 10
+        else:
+            break
+
+    return iterations
+
+
+def solve_numeric(lens_class, known, tolerance=1e-10, max_iterations=100):
+    """
+    Solve the lens equations for the variables missing in `known`.
+
+    The unknown variables start from the values of the lens `_seed`.
+    Return a dictionary with the found values and `Convergence`.
+    """
+    variables, equations, graph = lens_class.variables, lens_class.equations, lens_class._graph
+    functions = compile_equations(variables, equations)
+    values = np.array([float(known.get(variable, lens_class._seed[variable])) for variable in variables])
+    missing = {variable for variable in variables if variable not in known}
+
+    def solve_equation(index, variable):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values[variables.index(variable)] = compile_solution(variables, equations[index], variable)(values)
+
+    # The same order of the equations as in the symbolic solution.
+    unknowns = [len(used & missing) for used in graph.equation_variables]
+    ready = [index for index, count in enumerate(unknowns) if count == 1]
+    solved = set()
+    while len(solved) < len(missing) and ready:
+        index = heappop(ready)
+        if unknowns[index] != 1:
+            continue
+
+        variable, = graph.equation_variables[index] & (missing - solved)
+        solve_equation(index, variable)
+        solved.add(variable)
+        for other in graph.variable_equations[variable]:
+            unknowns[other] -= 1
+            if unknowns[other] == 1:
+                heappush(ready, other)
+
+    iterations = 0
+    remaining = missing - solved
+    if remaining:
+        rows = [index for index, count in enumerate(unknowns) if count > 1]
+        blocks = graph.blocks(rows, remaining) or [(rows, sorted(remaining, key=variables.index))]
+        for block_equations, block_variables in blocks:
+            if len(block_equations) == 1:
+                solve_equation(block_equations[0], block_variables[0])
+                continue
+
+            columns = [variables.index(variable) for variable in block_variables]
+            iterations += levenberg_marquardt(values, list(block_equations), columns, functions, tolerance, max_iterations)
+
+    residuals, jacobian, sizes = functions
+    columns = [index for index, variable in enumerate(variables) if variable in missing]
+    # The residuals and the rows of the Jacobian are relative to the size
+    # of the equations and the columns are scaled to the same norm,
+    # so that neither depends on the units (e.g. large radii).
+    with np.errstate(divide="ignore", invalid="ignore"):
+        row_weights = weights(sizes(values))
+        residual = float(np.max(np.abs(row_weights * np.array(residuals(values), dtype=float))))
+        matrix = row_weights[:, None] * np.array(jacobian(values), dtype=float)[:, columns]
+        norms = np.linalg.norm(matrix, axis=0)
+        matrix = matrix / np.where(norms > 0, norms, 1)
+    convergence = Convergence(
+        converged=bool(residual <= tolerance),
+        iterations=iterations,
+        residual=residual,
+        rank=int(np.linalg.matrix_rank(matrix)) if np.all(np.isfinite(matrix)) else 0,
+    )
+    results = {variables[index]: float(values[index]) for index in columns}
+
+    return results, convergence
@@ -0,0 +1,158 @@
+"""
+Design of lenses with the given properties.
+
+The lens is found by the Levenberg-Marquardt method started from many
+points at once. The outputs and their derivatives with respect to the free
+variables are derived once from the lens equations (for each set of known
+variables) and evaluated with NumPy for all the starting points together.
+"""
+from collections import namedtuple
+
+import numpy as np
+from sympy import Matrix, Symbol, lambdify, sympify
+
+from .analysis import given_values
+from .lens import Lens, _Plan
+
+Design = namedtuple("Design", ["lens", "success", "residual", "iterations"])
+Design.__doc__ = """
+Result of `design`.
+
+`lens` is the calculated lens which fits the targets best, `residual`
+is the largest relative difference between its outputs and the targets
+and `success` is True if it isn't larger than the tolerance.
+"""
+
+# Compiled outputs and their derivatives, see `_compile`.
+_functions = {}
+
+
+def _evaluate(function, arguments, shape):
+    # Constants (e.g. derivatives equal to zero) have to be broadcast.
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        values = function(*arguments)
+    return np.array([np.broadcast_to(value, shape) for value in values], dtype=float)
+
+
+def _compile(known, nps_zero, targets, free):
+    """
+    Return functions evaluating the `targets` and their derivatives
+    with respect to the `free` variables from the `known` variables.
+    """
+    key = known, nps_zero, targets, free
+    if key not in _functions:
+        plan = Lens._plan(known, nps_zero)
+        if plan is None:
+            raise ValueError("The fixed and the free variables don't determine the lens!")
+        if plan.error is not None:
+            raise ValueError(plan.error)
+        if plan.expressions is None:
+            # Generated solvers don't have the symbolic solution.
+            plan = Lens._plans[known, nps_zero] = _Plan.compile(Lens, known, nps_zero)
+
+        symbols = [Symbol(v) for v in plan.inputs]
+        outputs = Matrix([sympify(plan.expressions[target]) for target in targets])
+        jacobian = outputs.jacobian([Symbol(v) for v in free])
+        _functions[key] = (
+            plan.inputs,
+            lambdify(symbols, list(outputs), modules="numpy"),
+            lambdify(symbols, list(jacobian), modules="numpy"),
+        )
+    return _functions[key]
+
+
+def design(targets, bounds, base=None, tolerance=1e-9, starts=32, max_iterations=100, seed=0):
+    """
+    Find the lens with the given outputs.
+
+    `targets` maps the calculated variables (e.g. "EFL", "BFL") to their
+    values or to (low, high) ranges, `bounds` maps the free variables
+    (e.g. "r1", "r2", "CT", "nL") to (low, high) ranges. The rest
+    of the known variables is taken from the `base` lens
+    (or a dictionary), its values of the free variables are used
+    as one of the `starts` starting points, the rest is random.
+
+    Return `Design` with the best lens found.
+    """
+    values = given_values(base or {})
+    fixed = {v: value for v, value in values.items() if v not in bounds}
+    if unknown := (set(targets) | set(bounds)) - set(Lens.variables):
+        raise ValueError(f"Unknown variables: {', '.join(sorted(unknown))}")
+    if given := set(targets) & (set(fixed) | set(bounds)):
+        raise ValueError(f"The targets have to be calculated: {', '.join(sorted(given))}")
+    if not targets or not bounds:
+        raise ValueError("Both the targets and the bounds have to be given!")
+
+    free = tuple(v for v in Lens.variables if v in bounds)
+    names = tuple(v for v in Lens.variables if v in targets)
+    nps_zero = Lens._nps_zero(fixed)
+    inputs, outputs, derivatives = _compile(frozenset(fixed) | frozenset(free), nps_zero, names, free)
+
+    low, high = np.array([bounds[v] for v in free], dtype=float).T
+    if not np.all(np.isfinite(low) & np.isfinite(high) & (low <= high)):
+        raise ValueError("The bounds have to be finite ranges (low, high)!")
+    ranges = [targets[v] if isinstance(targets[v], (tuple, list)) else (targets[v], targets[v]) for v in names]
+    target_low, target_high = np.array(ranges, dtype=float).T
+    # The residuals are relative, so that all the targets have the same weight.
+    scale = np.maximum(np.maximum(abs(target_low), abs(target_high)), 1e-12)
+
+    random = np.random.default_rng(seed)
+    points = low + (high - low) * random.random((starts, len(free)))
+    if all(v in values for v in free):
+        points[0] = np.clip([float(values[v]) for v in free], low, high)
+
+    def evaluate(points):
+        arguments = [points[:, free.index(v)] if v in free else fixed[v] for v in inputs]
+        calculated = _evaluate(outputs, arguments, len(points)).T
+        residuals = (calculated - np.clip(calculated, target_low, target_high)) / scale
+        # Derivatives of the targets inside of their ranges are zero.
+        outside = (residuals != 0)[:, :, None]
+        jacobian = _evaluate(derivatives, arguments, len(points)).T.reshape(len(points), len(names), len(free))
+        jacobian = np.where(outside, jacobian / scale[:, None], 0)
+        cost = np.sum(residuals ** 2, axis=1)
+        cost[~np.isfinite(cost) | ~np.all(np.isfinite(jacobian), axis=(1, 2))] = np.inf
+        return residuals, jacobian, cost
+
+    residuals, jacobian, cost = evaluate(points)
+    damping = np.full(starts, 1e-3)
+    # The best costs of the last iterations, the search stops
+    # when the best point doesn't get better.
+    history = [np.min(cost)]
+    iterations = 0
+    while iterations < max_iterations:
+        error = np.max(np.abs(residuals), axis=1)
+        if np.any(error <= tolerance) or np.all((damping >= 1e10) | ~np.isfinite(cost)):
+            break
+        if len(history) > 10 and history[-1] > history[-11] * (1 - 1e-6):
+            break
+        iterations += 1
+
+        # Damped Gauss-Newton step scaled by the diagonal of the normal equations.
+        # The points can't leave the bounds, the variables at the bounds
+        # which would leave them aren't changed.
+        valid = np.isfinite(cost)
+        gradient = np.einsum("nij,ni->nj", jacobian[valid], residuals[valid])
+        blocked = ((points[valid] <= low) & (gradient > 0)) | ((points[valid] >= high) & (gradient < 0))
+        step_jacobian = np.where(blocked[:, None, :], 0, jacobian[valid])
+        matrix = np.einsum("nij,nik->njk", step_jacobian, step_jacobian)
+        gradient = np.where(blocked, 0, gradient)
+        diagonal = np.maximum(np.einsum("njj->nj", matrix), 1e-12)
+        matrix = matrix + (damping[valid][:, None] * diagonal)[:, :, None] * np.eye(len(free))
+        candidates = points.copy()
+        candidates[valid] = np.clip(points[valid] - np.linalg.solve(matrix, gradient[..., None])[..., 0], low, high)
+
+        new_residuals, new_jacobian, new_cost = evaluate(candidates)
+        # Negligible improvements are refused, so that the points
+        # stuck in a local minimum or at the bounds stop.
+        better = valid & (new_cost < cost * (1 - 1e-10))
+        points[better], residuals[better], jacobian[better], cost[better] = (
+            candidates[better], new_residuals[better], new_jacobian[better], new_cost[better],
+        )
+        damping = np.where(better, np.maximum(damping / 10, 1e-12), damping * 10)
+        history.append(np.min(cost))
+
+    best = int(np.argmin(cost))
+    residual = float(np.max(np.abs(residuals[best])))
+    lens = Lens(**fixed, **{v: float(value) for v, value in zip(free, points[best])})
+    lens.calculate()
+    return Design(lens, residual <= tolerance, residual, iterations)
@@ -0,0 +1,120 @@
+"""
+Calculation of many lenses in more processes.
+"""
+import os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import chain, count, islice
+
+from .lens import Lens
+
+# Number of the most frequent sets of known variables
+# prepared by every worker before the calculation.
+WARM_UP = 5
+
+
+def signature(record):
+    """
+    Return the known variables of the `record` and whether NPS is zero,
+    the compiled solution of the lens equations depends only on these.
+    """
+    known = {variable: value for variable, value in record.items() if value is not None}
+    return frozenset(known), Lens._nps_zero(known)
+
+
+def warm_up(signatures):
+    """
+    Compile the solutions of the lens equations for the `signatures`
+    (pairs of known variables and NPS being zero).
+    """
+    for known, nps_zero in signatures:
+        if known and set(known) <= set(Lens.variables):
+            Lens._plan(frozenset(known), nps_zero)
+
+
+def solve_chunk(records, method):
+    """
+    Calculate the lenses, return a list of calculated lenses
+    and exceptions for the lenses which can't be calculated.
+    """
+    results = []
+    for record in records:
+        try:
+            lens = Lens(**record)
+            lens.calculate(method)
+        except Exception as error:  # One lens mustn't stop the others.
+            results.append(error)
+        else:
+            results.append(lens)
+    return results
+
+
+def chunked(records, size):
+    """
+    Yield pairs (index of the first record, list of the records)
+    with `size` records from the iterator `records`.
+    """
+    for start in count(0, size):
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield start, chunk
+
+
+def solve_many(records, workers=None, ordered=True, chunk_size=100, warm_up_sets=None, method="symbolic", errors="raise"):
+    """
+    Calculate lenses given as dictionaries of the known variables
+    in `workers` processes (by default one for each CPU).
+
+    The records are sent to the workers in chunks of `chunk_size`, only
+    a few chunks are processed at once, so `records` can be a long iterator.
+    Every worker compiles the solutions for the `warm_up_sets`
+    (collections of the known variables) when it starts, by default
+    for the most frequent sets of the first records.
+
+    Yield the calculated lenses in the order of the `records`, or pairs
+    (index of the record, lens) in the order in which they are calculated
+    if `ordered` is false. With `errors="return"` the exception is yielded
+    instead of the lens which can't be calculated, otherwise it is raised.
+    """
+    if errors not in ("raise", "return"):
+        raise ValueError(f"Unknown errors handling: {errors}")
+
+    workers = workers or os.cpu_count() or 1
+    records = iter(records)
+    first = list(islice(records, chunk_size * workers))
+    if warm_up_sets is None:
+        signatures = [known for known, _ in Counter(map(signature, first)).most_common(WARM_UP)]
+    else:
+        signatures = []
+        for known in map(frozenset, warm_up_sets):
+            signatures.append((known, False))
+            if {"n1", "n2"} <= known:
+                signatures.append((known, True))
+
+    chunks = chunked(chain(first, records), chunk_size)
+    executor = ProcessPoolExecutor(workers, initializer=warm_up, initargs=(signatures,))
+    pending = {}  # Future of each processed chunk and its start.
+
+    def submit(number):
+        # The chunks are submitted only when there is space for them.
+        for start, chunk in islice(chunks, number):
+            pending[executor.submit(solve_chunk, chunk, method)] = start
+
+    try:
+        submit(2 * workers)
+        while pending:
+            if ordered:
+                done = [next(iter(pending))]  # The dictionary keeps the order.
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                start = pending.pop(future)
+                for index, result in enumerate(future.result(), start):
+                    if isinstance(result, Exception) and errors == "raise":
+                        raise result
+                    yield result if ordered else (index, result)
+                submit(1)
+    finally:
+        executor.shutdown(cancel_futures=True)
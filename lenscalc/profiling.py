@@ -0,0 +1,167 @@
+"""
+Measurement of the phases of the calculation of the lenses.
+
+The measurement is turned on by adding a callback (or using `profile`),
+which is called with `Timer` of every calculation. When there aren't
+any callbacks, the calculation isn't measured at all.
+
+    with profile() as result:
+        lens.calculate()
+    print(result.phases)
+"""
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+
+_callbacks = []
+_current = ContextVar("timer", default=None)
+_off = nullcontext()
+
+
+class Timer:
+    """
+    Measurement of one calculation.
+
+    `phases` maps the phases to their time in seconds (the time of each
+    phase is measured from the end of the previous one), `single` and
+    `simultaneous` are the numbers of the equations solved one by one
+    and together, `path` is the way the lens was calculated
+    ("plan", "symbolic" or "numeric") and `error` is the name
+    of the exception if the calculation failed.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.single = self.simultaneous = 0
+        self.path = self.error = None
+        self._last = perf_counter()
+
+    def lap(self, phase):
+        """
+        Add the time since the end of the previous phase to the `phase`.
+        """
+        now = perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0) + now - self._last
+        self._last = now
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, error_type, error, traceback):
+        _current.reset(self._token)
+        self.lap("other")
+        if error_type is not None:
+            self.error = error_type.__name__
+        for callback in list(_callbacks):
+            callback(self)
+
+
+def measure():
+    """
+    Return a context manager measuring the calculation, it gives
+    `Timer` if the calculations are measured and None otherwise.
+    """
+    return Timer() if _callbacks else _off
+
+
+def current():
+    """
+    Return `Timer` of the calculation which is being measured or None.
+    """
+    return _current.get()
+
+
+@contextmanager
+def suspend():
+    """
+    Don't measure the calculation inside the `with` block.
+    """
+    token = _current.set(None)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def add_callback(callback):
+    """
+    Call the `callback` with `Timer` after every calculation.
+    """
+    _callbacks.append(callback)
+
+
+def remove_callback(callback):
+    _callbacks.remove(callback)
+
+
+class Profile:
+    """
+    Sum of the measurements of the calculations, it is used as a callback.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.calculations = 0
+        self.phases = defaultdict(float)
+        self.paths = Counter()
+        self.errors = Counter()
+        self.single = self.simultaneous = 0
+
+    def __call__(self, timer):
+        with self.lock:
+            self.calculations += 1
+            for phase, seconds in timer.phases.items():
+                self.phases[phase] += seconds
+            self.paths[timer.path] += 1
+            if timer.error is not None:
+                self.errors[timer.error] += 1
+            self.single += timer.single
+            self.simultaneous += timer.simultaneous
+
+    def metrics(self):
+        """
+        Return the measurements as a dictionary.
+        """
+        with self.lock:
+            return {
+                "calculations": self.calculations,
+                "phases": dict(self.phases),
+                "paths": {str(path): count for path, count in self.paths.items()},
+                "errors": dict(self.errors),
+                "equations": {"single": self.single, "simultaneous": self.simultaneous},
+            }
+
+    def prometheus(self, prefix="lenscalc"):
+        """
+        Return the measurements in the text format of Prometheus.
+        """
+        metrics = self.metrics()
+        lines = [
+            f"# TYPE {prefix}_calculations_total counter",
+            f"{prefix}_calculations_total {metrics['calculations']}",
+            f"# TYPE {prefix}_phase_seconds_total counter",
+            *(f'{prefix}_phase_seconds_total{{phase="{phase}"}} {seconds}' for phase, seconds in metrics["phases"].items()),
+            f"# TYPE {prefix}_path_total counter",
+            *(f'{prefix}_path_total{{path="{path}"}} {count}' for path, count in metrics["paths"].items()),
+            f"# TYPE {prefix}_errors_total counter",
+            *(f'{prefix}_errors_total{{error="{error}"}} {count}' for error, count in metrics["errors"].items()),
+            f"# TYPE {prefix}_equations_total counter",
+            *(f'{prefix}_equations_total{{solved="{kind}"}} {count}' for kind, count in metrics["equations"].items()),
+        ]
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def profile():
+    """
+    Measure the calculations inside the `with` block, give `Profile`.
+    """
+    result = Profile()
+    add_callback(result)
+    try:
+        yield result
+    finally:
+        remove_callback(result)
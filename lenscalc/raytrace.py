@@ -0,0 +1,72 @@
+"""
+Paraxial ray tracing through lenses and lens systems.
+
+The rays are given by their heights and angles at a plane before the first
+vertex, they are traced using the ray-transfer matrix of the system
+(see `lenscalc.system`), so millions of rays take a few array operations.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .system import LensSystem, _value
+
+Trace = namedtuple("Trace", ["heights", "angles"])
+Trace.__doc__ = """
+Traced rays: `heights` at each of the planes (an array with a row
+for each plane) and `angles` after the last surface.
+"""
+
+
+def _system(optics):
+    # The matrix of the lens or of the system and the refractive indexes
+    # before and after it.
+    system = optics if isinstance(optics, LensSystem) else LensSystem([optics])
+    matrix = system.matrix
+    if matrix.ndim != 2:
+        raise ValueError("Only one variant of the system can be traced!")
+    return matrix, float(_value(system.elements[0], "n1")), float(_value(system.elements[-1], "n2"))
+
+
+def trace_chunks(optics, rays, planes=(0,), start=0):
+    """
+    Trace the `rays` (an iterable of pairs of arrays of heights and angles)
+    through the lens or `LensSystem`, yield `Trace` for each pair.
+
+    The rays start at the plane in the distance `start` from the first
+    vertex, the `planes` are the distances from the last vertex
+    (in the same direction as the rays, e.g. `lens.BFL`).
+    """
+    matrix, n1, n2 = _system(optics)
+    (a, b), (c, d) = matrix
+    planes = np.asarray(planes, dtype=float).reshape(-1, 1)
+
+    for heights, angles in rays:
+        heights, angles = np.broadcast_arrays(np.asarray(heights, dtype=float), np.asarray(angles, dtype=float))
+        # From the starting plane to the first vertex.
+        heights = heights - start * angles
+        # The matrix acts on the heights and the angles times the refractive index.
+        out_heights = a * heights + b * n1 * angles
+        out_angles = (c * heights + d * n1 * angles) / n2
+        yield Trace(out_heights + planes * out_angles, out_angles)
+
+
+def trace(optics, heights, angles, planes=(0,), start=0, chunk_size=1_000_000):
+    """
+    Trace the rays with the `heights` and `angles` (arrays)
+    through the lens or `LensSystem`, see `trace_chunks`.
+
+    The rays are traced in chunks of `chunk_size`,
+    so only the results take the memory proportional to the rays.
+    Return `Trace`.
+    """
+    heights, angles = np.broadcast_arrays(np.ravel(heights), np.ravel(angles))
+    planes = np.atleast_1d(np.asarray(planes, dtype=float))
+    result = Trace(np.empty((len(planes), len(heights))), np.empty(len(heights)))
+
+    ranges = [slice(start_index, start_index + chunk_size) for start_index in range(0, len(heights), chunk_size)]
+    chunks = trace_chunks(optics, ((heights[rows], angles[rows]) for rows in ranges), planes, start)
+    for rows, chunk in zip(ranges, chunks):
+        result.heights[:, rows] = chunk.heights
+        result.angles[rows] = chunk.angles
+    return result
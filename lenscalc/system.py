@@ -0,0 +1,131 @@
+"""
+Optical systems of more lenses.
+
+The system is described by its ray-transfer (ABCD) matrix acting on the
+height of the ray and its reduced angle (the angle times the refractive
+index). The matrices of all the variants of the system are multiplied
+at once, as arrays with the variants in the first axes.
+"""
+import numpy as np
+
+# Variables of the lenses needed for their matrices.
+_ELEMENT_VARIABLES = "n1", "nL", "n2", "r1", "r2", "CT"
+
+
+def _value(element, variable):
+    # The value of the `variable` of a lens, a dictionary or `LensTable`.
+    if hasattr(element, "keys") or hasattr(element, "to_numpy"):
+        value = element[variable]
+    else:
+        value = getattr(element, variable)
+    if value is None:
+        raise ValueError(f"The lenses have to have {', '.join(_ELEMENT_VARIABLES)}, {variable} is missing!")
+    return np.asarray(value, dtype=float)
+
+
+def refraction(power):
+    """
+    Return the matrices of the refraction by surfaces with the `power` (array).
+    """
+    matrix = np.zeros(np.shape(power) + (2, 2))
+    matrix[..., 0, 0] = matrix[..., 1, 1] = 1
+    matrix[..., 1, 0] = -power
+    return matrix
+
+
+def translation(distance, index):
+    """
+    Return the matrices of the translation by the `distance`
+    in the medium with the refractive `index` (arrays).
+    """
+    distance, index = np.broadcast_arrays(distance, index)
+    matrix = np.zeros(distance.shape + (2, 2))
+    matrix[..., 0, 0] = matrix[..., 1, 1] = 1
+    matrix[..., 0, 1] = distance / index
+    return matrix
+
+
+class LensSystem:
+    """
+    Lenses (`elements`) one after another, `gaps` are the distances
+    between the second vertex of a lens and the first vertex of the next one.
+
+    The elements are lenses, dictionaries or `LensTable`s with the values
+    of n1, nL, n2, r1, r2 and CT, the values (and the gaps) can be arrays
+    of the variants of the system. The medium after a lens has to be
+    the same as the medium before the next one (n2 and n1).
+
+    `calculate` sets the variables of the whole system: D, EFL, f1, f2,
+    FFL, BFL, NPS and P1 and P2 (the principal planes measured
+    from the first and the last vertex).
+    """
+
+    variables = "D", "n1", "n2", "P1", "P2", "f1", "f2", "EFL", "FFL", "BFL", "NPS"
+
+    def __init__(self, elements, gaps=()):
+        if not elements:
+            raise ValueError("The system has to have at least one lens!")
+        if len(gaps) != len(elements) - 1:
+            raise ValueError("There has to be a gap between each two lenses!")
+        self.elements = list(elements)
+        self.gaps = list(gaps)
+        for variable in self.variables:
+            setattr(self, variable, None)
+
+    @property
+    def matrix(self):
+        """
+        Ray-transfer matrix from the first to the last vertex.
+        """
+        elements = [{variable: _value(element, variable) for variable in _ELEMENT_VARIABLES} for element in self.elements]
+        for before, after in zip(elements, elements[1:]):
+            if not np.allclose(before["n2"], after["n1"]):
+                raise ValueError("The medium after a lens has to be the same as before the next one!")
+
+        steps = []
+        for index, element in enumerate(elements):
+            if index:
+                steps.append(translation(self.gaps[index - 1], element["n1"]))
+            steps.append(refraction((element["nL"] - element["n1"]) / element["r1"]))
+            steps.append(translation(element["CT"], element["nL"]))
+            steps.append(refraction((element["n2"] - element["nL"]) / element["r2"]))
+
+        matrix = np.eye(2)
+        for step in steps:
+            matrix = step @ matrix
+        return matrix
+
+    def calculate(self):
+        """
+        Calculate the variables of the system.
+        """
+        matrix = self.matrix
+        n1, n2 = _value(self.elements[0], "n1"), _value(self.elements[-1], "n2")
+        a, c, d = matrix[..., 0, 0], matrix[..., 1, 0], matrix[..., 1, 1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            power = -c
+            efl = 1 / power
+            results = {
+                "D": power,
+                "n1": n1,
+                "n2": n2,
+                "EFL": efl,
+                "f1": -n1 * efl,
+                "f2": n2 * efl,
+                "P1": n1 * (1 - d) * efl,
+                "P2": n2 * (a - 1) * efl,
+                "FFL": -n1 * d * efl,
+                "BFL": n2 * a * efl,
+                "NPS": (n2 - n1) * efl,
+            }
+
+        for variable, value in results.items():
+            value = np.broadcast_to(value, np.shape(power))
+            setattr(self, variable, float(value) if value.ndim == 0 else np.array(value))
+
+    def __str__(self):
+        return "\n".join(f"{var}: {getattr(self, var)}" for var in self.variables)
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,195 @@
+"""
+Many lenses stored in one NumPy array.
+"""
+import numpy as np
+
+from .compact import CompactLens
+from .lens import Lens
+
+
+class LensTable:
+    """
+    Lenses stored as one array of floats.
+
+    `values` has a row for each lens and a column for each variable
+    (in the order of `Lens.variables`), the missing values are NaN.
+    The array is in column-major order, so the columns can be exported
+    without copying. `known` has a bit for each variable of each lens
+    (the same as in `Lens._mask`), which is set if the value was given
+    and not calculated.
+    """
+
+    variables = Lens.variables
+
+    def __init__(self, values, known=None):
+        self.values = np.asfortranarray(values, dtype=float)
+        if self.values.ndim != 2 or self.values.shape[1] != len(self.variables):
+            raise ValueError(f"The values have to be an array with {len(self.variables)} columns!")
+
+        if known is None:
+            known = ~np.isnan(self.values) @ (1 << np.arange(len(self.variables)))
+        # The same as the values, the array isn't copied (e.g. a memory-mapped one).
+        self.known = np.asarray(known, dtype=np.uint32)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Create a table from a dictionary mapping the known variables
+        to arrays (or single numbers) of their values.
+        """
+        if not columns:
+            raise ValueError("No variables were given!")
+        if unknown := set(columns) - set(cls.variables):
+            raise ValueError(f"Unknown variables: {', '.join(sorted(unknown))}")
+
+        arrays = dict(zip(columns, np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float)) for v in columns.values()))))
+        size = len(next(iter(arrays.values())))
+        values = np.full((size, len(cls.variables)), np.nan, order="F")
+        for variable, array in arrays.items():
+            values[:, cls.variables.index(variable)] = array
+
+        return cls(values)
+
+    @classmethod
+    def from_lenses(cls, lenses):
+        """
+        Create a table from lenses (`Lens` or `CompactLens`),
+        only their given (not calculated) values are known.
+        """
+        values, known = [], []
+        for lens in lenses:
+            values.append([np.nan if (value := getattr(lens, v)) is None else float(value) for v in cls.variables])
+            if isinstance(lens, CompactLens):
+                given = lens.given
+            else:
+                # The calculated values are kept, but they aren't known,
+                # so the row can be changed and calculated again.
+                calculated = getattr(lens, "_calculated", None) or {}
+                given = {v for v, value in zip(cls.variables, values[-1]) if not np.isnan(value) and v not in calculated}
+            known.append(Lens._mask(given, False))
+
+        return cls(np.array(values, dtype=float).reshape(-1, len(cls.variables)), np.array(known, dtype=np.uint32))
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, key):
+        """
+        Return the lens with the index `key` (changing it changes the table)
+        or the column of the variable `key`.
+        """
+        if isinstance(key, str):
+            if key not in self.variables:
+                raise KeyError(key)
+            return self.values[:, self.variables.index(key)]
+
+        index = range(len(self))[key]
+        return _Row._from_table(self, index)
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    def calculate(self):
+        """
+        Calculate the missing variables of all the lenses.
+
+        The lenses with the same known variables are calculated at once
+        with `Lens.calculate_batch`. The lenses which can't be calculated
+        keep NaN for the missing variables, the rest is calculated anyway.
+        Return a dictionary mapping the error messages to arrays
+        of the indexes of these lenses (empty if there isn't any).
+        """
+        errors = {}
+        everything = (1 << len(self.variables)) - 1
+        for mask in map(int, np.unique(self.known)):
+            if mask == everything:
+                continue
+
+            rows = np.flatnonzero(self.known == mask)
+            known = {
+                variable: self.values[rows, index]
+                for index, variable in enumerate(self.variables)
+                if mask >> index & 1
+            }
+            try:
+                results = Lens.calculate_batch(known)
+            except ValueError as error:
+                message = str(error)
+                errors[message] = np.concatenate([errors[message], rows]) if message in errors else rows
+                continue
+            for index, variable in enumerate(self.variables):
+                if not mask >> index & 1:
+                    self.values[rows, index] = results[variable]
+
+        return {message: np.sort(rows) for message, rows in errors.items()}
+
+    def to_numpy(self):
+        """
+        Return the array with the values (not a copy).
+        """
+        return self.values
+
+    def to_pandas(self):
+        """
+        Return the values as a `pandas.DataFrame` without copying them.
+        """
+        try:
+            import pandas
+        except ImportError as error:
+            raise ImportError("pandas is needed for the export to pandas") from error
+
+        return pandas.DataFrame(self.values, columns=list(self.variables), copy=False)
+
+    def to_arrow(self):
+        """
+        Return the values as a `pyarrow.Table` without copying them.
+        """
+        try:
+            import pyarrow
+        except ImportError as error:
+            raise ImportError("pyarrow is needed for the export to Arrow") from error
+
+        columns = [pyarrow.array(self.values[:, index]) for index in range(len(self.variables))]
+        return pyarrow.table(columns, names=list(self.variables))
+
+    def __repr__(self):
+        return f"<LensTable with {len(self)} lenses>"
+
+
+class _Row(CompactLens):
+    """
+    Lens stored in a row of `LensTable`.
+
+    Setting a variable marks it as known in the table,
+    only the known variables are used for the calculation.
+    """
+
+    __slots__ = "_table", "_index"
+
+    @classmethod
+    def _from_table(cls, table, index):
+        lens = cls._from_values(table.values[index])
+        lens._table = table
+        lens._index = index
+        return lens
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self.variables:
+            bit = 1 << self.variables.index(name)
+            known = int(self._table.known[self._index])
+            self._table.known[self._index] = known & ~bit if getattr(self, name) is None else known | bit
+
+    @property
+    def replacements(self):
+        known = int(self._table.known[self._index])
+        return {
+            variable: float(value)
+            for index, (variable, value) in enumerate(zip(self.variables, self._values))
+            if known >> index & 1
+        }
+
+    @property
+    def given(self):
+        # The known values in the table are the given ones.
+        return self.replacements
@@ -1,10 +1,26 @@
 from collections import OrderedDict
+import time
 
 import flask
 
-from lenscalc import Lens
+from lenscalc import profiling
+
+from .cache import FileBackend, ResultCache, SQLiteBackend
+from .solver import Solver, SolverBusy, SolverTimeout, parse_values
 
 app = flask.Flask(__name__)
+app.config.update(
+    SOLVER_WORKERS=4,  # Number of threads calculating the lenses
+    SOLVER_TIMEOUT=10,  # Seconds
+    SOLVER_MAX_PENDING=16,  # Lenses calculated or waiting at once
+    API_MAX_BATCH=16,  # Lenses in one request to /api/solve/batch
+    CACHE_SIZE=1024,  # Calculated lenses kept in the memory, 0 turns the cache off
+    CACHE_TTL=3600,  # Seconds
+    CACHE_TOLERANCE=1e-9,  # Relative difference of the values sharing the result
+    CACHE_BACKEND=None,  # "file" or "sqlite" to share the cache between processes
+    CACHE_PATH=None,  # Directory ("file") or database ("sqlite") of the backend
+    PROFILING=False,  # Measure the phases of the calculations, see /metrics
+)
 
 variables_info = OrderedDict([
     ("D1", {"HTML": "D<sub>1</sub>", "description": "Surface 1 (object) power", "unit": "mm"}),
@@ -27,27 +43,120 @@ variables_info = OrderedDict([
 ])
 
 
+def get_solver():
+    # The solver is created with the first request,
+    # so that the configuration can be changed before it.
+    if "lenscalc_solver" not in app.extensions:
+        if app.config["PROFILING"]:
+            app.extensions["lenscalc_profile"] = profile = profiling.Profile()
+            profiling.add_callback(profile)
+        app.extensions["lenscalc_solver"] = Solver(
+            app.config["SOLVER_WORKERS"], app.config["SOLVER_TIMEOUT"], app.config["SOLVER_MAX_PENDING"], get_cache(),
+        )
+    return app.extensions["lenscalc_solver"]
+
+
+def get_cache():
+    if not app.config["CACHE_SIZE"]:
+        return None
+
+    backends = {None: None, "file": FileBackend, "sqlite": SQLiteBackend}
+    backend = backends[app.config["CACHE_BACKEND"]]
+    return ResultCache(
+        app.config["CACHE_SIZE"],
+        app.config["CACHE_TTL"],
+        app.config["CACHE_TOLERANCE"],
+        backend(app.config["CACHE_PATH"]) if backend is not None else None,
+    )
+
+
 @app.route("/")
 def index():
-    return flask.render_template("index.html", variables=variables_info)
+    return flask.render_template("index.html", variables=variables_info, values={})
 
 
 @app.route("/result/")
-def result(variables=None, values=None):
-    values_from_input = {}
-    for arg in flask.request.args:
-        if flask.request.args[arg] != "":
-            # The type of the value from the web app is a string.
-            # It is converted to float before it is passed to lenscalc.
-            values_from_input[arg] = float(flask.request.args[arg])
-            variables_info[arg]["value"] = float(flask.request.args[arg])
-
-    lens = Lens(**values_from_input)
+def result():
+    # The values are kept only for this request,
+    # `variables_info` is shared by all the requests.
+    values = {variable: value for variable, value in flask.request.args.items() if value != ""}
+    try:
+        calculated_values = get_solver().solve(parse_values(values))
+    except (ValueError, SolverBusy, SolverTimeout) as error:
+        return flask.render_template("index.html", variables=variables_info, values=values, error=str(error))
+
+    return flask.render_template("result.html", variables=variables_info, values=values, calculated=calculated_values)
+
+
+@app.route("/api/solve", methods=["POST"])
+def api_solve():
     try:
-        lens.calculate()
-    except ValueError:
-        return flask.render_template("index.html", variables=variables_info)
+        values = parse_values(flask.request.get_json(force=True) or {})
+        calculated_values = get_solver().solve(values)
+    except ValueError as error:
+        return {"error": str(error)}, 400
+    except SolverBusy as error:
+        return {"error": str(error)}, 503
+    except SolverTimeout as error:
+        return {"error": str(error)}, 504
+
+    return {"lens": calculated_values}
+
+
+@app.route("/api/solve/batch", methods=["POST"])
+def api_solve_batch():
+    lenses = flask.request.get_json(force=True)
+    if not isinstance(lenses, list):
+        return {"error": "A list of lenses was expected."}, 400
+    if len(lenses) > app.config["API_MAX_BATCH"]:
+        return {"error": f"At most {app.config['API_MAX_BATCH']} lenses can be calculated at once."}, 413
+
+    solver = get_solver()
+    futures = []
+    for values in lenses:
+        # An error of one lens is reported only for that lens.
+        try:
+            futures.append(solver.submit(parse_values(values)))
+        except Exception as error:
+            futures.append(error)
+
+    # All the lenses together have the time of the solver.
+    deadline = time.monotonic() + solver.timeout
+    results = []
+    for future in futures:
+        try:
+            if isinstance(future, Exception):
+                raise future
+            calculated_values = solver.result(future, max(deadline - time.monotonic(), 0))
+        except Exception as error:
+            results.append({"error": str(error) or type(error).__name__})
+        else:
+            results.append({"lens": calculated_values})
+
+    return {"results": results}
+
+
+@app.route("/api/cache")
+def api_cache():
+    cache = get_solver().cache
+    if cache is None:
+        return {"error": "The cache is turned off."}, 404
+    return cache.stats()
+
+
+@app.route("/metrics")
+def metrics():
+    # Metrics in the text format of Prometheus.
+    solver = get_solver()
+    if "lenscalc_profile" not in app.extensions and solver.cache is None:
+        return {"error": "The profiling and the cache are turned off."}, 404
 
-    calculated_values = lens.__dict__
+    text = ""
+    if "lenscalc_profile" in app.extensions:
+        text += app.extensions["lenscalc_profile"].prometheus()
+    if solver.cache is not None:
+        for name, value in solver.cache.stats().items():
+            kind = "counter" if name in ("hits", "misses") else "gauge"
+            text += f"# TYPE lenscalc_cache_{name} {kind}\nlenscalc_cache_{name} {value}\n"
 
-    return flask.render_template("result.html", variables=variables_info, calculated=calculated_values)
+    return text, 200, {"Content-Type": "text/plain; version=0.0.4"}
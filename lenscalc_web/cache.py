@@ -0,0 +1,167 @@
+"""
+Cache of the calculated lenses for the web app.
+
+The lenses are cached by their known variables rounded to the tolerance,
+the least recently used lenses are removed when the cache is full
+and all lenses expire after some time. The cache can be shared by more
+processes using a backend storing the lenses in files or in SQLite.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import closing
+from math import floor, log10
+from pathlib import Path
+from threading import Lock
+
+
+class FileBackend:
+    """
+    Lenses stored as JSON files in a directory.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key):
+        return self.directory / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+    def get(self, key):
+        try:
+            entry = json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        if entry["key"] != key or entry["expires"] < time.time():
+            return None
+        return entry["value"]
+
+    def set(self, key, value, expires, max_size=None):
+        # Written to a temporary file first, so that other processes
+        # never read a half written file.
+        path = self._path(key)
+        temporary = path.with_suffix(f".{time.monotonic_ns()}.tmp")
+        temporary.write_text(json.dumps({"key": key, "value": value, "expires": expires}))
+        temporary.replace(path)
+        if max_size is not None:
+            self._evict(max_size)
+
+    def _evict(self, max_size):
+        # The oldest files over `max_size` are removed,
+        # other processes can remove them at the same time.
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime_ns, path))
+            except OSError:
+                continue
+        files.sort()
+        for _, path in files[:max(len(files) - max_size, 0)]:
+            path.unlink(missing_ok=True)
+
+
+class SQLiteBackend:
+    """
+    Lenses stored in an SQLite database.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        with closing(self._connect()) as connection, connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS lenses (key TEXT PRIMARY KEY, value TEXT, expires REAL)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, key):
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT value FROM lenses WHERE key = ? AND expires >= ?", (key, time.time()),
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set(self, key, value, expires, max_size=None):
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM lenses WHERE expires < ?", (time.time(),))
+            connection.execute("INSERT OR REPLACE INTO lenses VALUES (?, ?, ?)", (key, json.dumps(value), expires))
+            if max_size is not None:
+                # All the lenses have the same time to live,
+                # the ones expiring first are the oldest.
+                connection.execute(
+                    "DELETE FROM lenses WHERE key NOT IN (SELECT key FROM lenses ORDER BY expires DESC LIMIT ?)", (max_size,),
+                )
+
+
+class ResultCache:
+    """
+    At most `max_size` calculated lenses kept for `ttl` seconds.
+
+    The values of the known variables which differ less than
+    the relative `tolerance` share one result. The results have to be
+    JSON serializable if the `backend` (`FileBackend`, `SQLiteBackend`)
+    is used, the backend keeps at most `max_size` lenses too
+    (the oldest ones are removed).
+    """
+
+    def __init__(self, max_size=1024, ttl=3600, tolerance=1e-9, backend=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.digits = max(0, floor(-log10(tolerance)))
+        self.backend = backend
+        self.entries = OrderedDict()  # Key: (expiration time, result)
+        self.lock = Lock()
+        self.hits = self.misses = 0
+
+    def key(self, values):
+        """
+        Return the key of the known variables `values`.
+        """
+        return json.dumps({variable: f"{value:.{self.digits}e}" for variable, value in sorted(values.items())})
+
+    def get(self, values):
+        """
+        Return the cached result for the `values` or None.
+        """
+        key = self.key(values)
+        with self.lock:
+            if key in self.entries:
+                expires, result = self.entries[key]
+                if expires >= time.time():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self.entries[key]
+
+        result = self.backend.get(key) if self.backend is not None else None
+        with self.lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._store(key, result, time.time() + self.ttl)
+        return result
+
+    def set(self, values, result):
+        """
+        Cache the `result` for the `values`.
+        """
+        key, expires = self.key(values), time.time() + self.ttl
+        self._store(key, result, expires)
+        if self.backend is not None:
+            self.backend.set(key, result, expires, self.max_size)
+
+    def _store(self, key, result, expires):
+        with self.lock:
+            self.entries[key] = expires, result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        """
+        Return the numbers of hits and misses and the size of the cache.
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "max_size": self.max_size}
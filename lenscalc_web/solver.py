@@ -0,0 +1,169 @@
+"""
+Calculation of the lenses for the web app in a bounded pool of threads.
+
+A slow calculation doesn't block the request longer than the timeout
+and when too many lenses are being calculated, new ones are refused
+instead of waiting in a queue.
+"""
+import concurrent.futures
+from math import isfinite
+from threading import BoundedSemaphore, Lock
+
+from lenscalc import Lens
+
+
+class SolverBusy(Exception):
+    """
+    Too many lenses are being calculated.
+    """
+
+
+class SolverTimeout(Exception):
+    """
+    The lens wasn't calculated in time.
+    """
+
+
+def parse_values(values):
+    """
+    Return the known variables from the `values` (e.g. request arguments)
+    as floats, empty values are skipped.
+
+    Raise ValueError for unknown variables and values which aren't numbers.
+    """
+    if not isinstance(values, dict):
+        raise ValueError("The variables have to be given as a dictionary.")
+
+    result = {}
+    for variable, value in values.items():
+        if variable not in Lens.variables:
+            raise ValueError(f"Unknown variable: {variable}")
+        if value in ("", None):
+            continue
+        try:
+            result[variable] = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"The value of {variable} isn't a number: {value!r}") from None
+
+    return result
+
+
+def json_value(value):
+    """
+    Return the value of a variable which can be converted to JSON.
+
+    SymPy numbers are converted to floats, the values which aren't finite
+    real numbers (e.g. complex infinity) are converted to strings.
+    """
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except TypeError:
+        return str(value)
+    return number if isfinite(number) else str(value)
+
+
+def calculate(values):
+    """
+    Calculate the lens, return the values of all its variables.
+    """
+    lens = Lens(**values)
+    lens.calculate()
+    return {variable: json_value(getattr(lens, variable)) for variable in Lens.variables}
+
+
+class Solver:
+    """
+    Pool of `workers` threads calculating the lenses.
+
+    At most `max_pending` lenses are calculated or waiting at once.
+    The results are saved in the `cache` (see `cache.ResultCache`).
+
+    A lens which timed out frees its slot, but the thread can't be stopped,
+    it keeps calculating the lens (it is abandoned). When all the threads
+    calculate abandoned lenses, new ones are refused.
+    """
+
+    def __init__(self, workers=4, timeout=10, max_pending=None, cache=None):
+        self.executor = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix="lenscalc")
+        self.workers = workers
+        self.timeout = timeout
+        self.slots = BoundedSemaphore(max_pending or 4 * workers)
+        self.cache = cache
+        # Futures holding a slot and the abandoned ones still running.
+        self.lock = Lock()
+        self.holding = set()
+        self.abandoned = set()
+
+    def submit(self, values):
+        """
+        Start the calculation of the lens, return its future.
+
+        Raise ValueError for the values which don't determine the lens
+        (see `Lens.structure`) without calculating them.
+        """
+        if values and (structure := Lens.structure(values)).missing:
+            raise ValueError(
+                f"The known variables don't determine the lens! "
+                f"Give {structure.missing} more of: {', '.join(structure.undetermined)}"
+            )
+
+        if self.cache is not None and (cached := self.cache.get(values)) is not None:
+            future = concurrent.futures.Future()
+            future.set_result(cached)
+            return future
+
+        with self.lock:
+            busy = len(self.abandoned) >= self.workers
+        if busy or not self.slots.acquire(blocking=False):
+            raise SolverBusy("Too many lenses are being calculated, try it again later.")
+
+        future = self.executor.submit(self._calculate, values)
+        with self.lock:
+            self.holding.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def _release(self, future):
+        # The slot is released only once, when the lens is calculated
+        # or when it times out.
+        with self.lock:
+            if future in self.holding:
+                self.holding.remove(future)
+                self.slots.release()
+
+    def _done(self, future):
+        self._release(future)
+        with self.lock:
+            self.abandoned.discard(future)
+
+    def _calculate(self, values):
+        # The result is cached before the future is done,
+        # so that the next request finds it.
+        result = calculate(values)
+        if self.cache is not None:
+            self.cache.set(values, result)
+        return result
+
+    def result(self, future, timeout=None):
+        """
+        Wait for the result of the calculation at most `timeout` seconds
+        (by default the timeout of the solver).
+        """
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except concurrent.futures.TimeoutError:
+            # The waiting lens isn't calculated at all.
+            if not future.cancel():
+                with self.lock:
+                    if not future.done():
+                        self.abandoned.add(future)
+            self._release(future)
+            raise SolverTimeout("The calculation takes too long.") from None
+
+    def solve(self, values):
+        """
+        Calculate the lens, return the values of all its variables.
+        """
+        return self.result(self.submit(values))
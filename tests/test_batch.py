@@ -0,0 +1,61 @@
+from math import isclose
+
+import numpy as np
+import pytest
+
+from lenscalc import Lens
+from test_variable_combinations import ORIGINAL_LENS
+
+
+def test_batch_single_lens():
+    """
+    Test a batch with a single lens given as numbers.
+    """
+    result = Lens.calculate_batch({"n1": 1.0003, "nL": 1.5, "n2": 1.0003, "r1": 50, "r2": -40, "CT": 3})
+
+    for variable in Lens.variables:
+        assert isclose(result[variable], getattr(ORIGINAL_LENS, variable), abs_tol=1e-12)
+
+
+def test_batch_same_as_calculate():
+    """
+    Test that the batch gives the same result as `Lens.calculate`.
+
+    Some of the lenses have the same n1 and n2, some don't.
+    """
+    known = {
+        "n1": 1.0003,
+        "nL": np.array([1.5, 1.6, 1.7]),
+        "n2": np.array([1.0003, 1.33, 1.0003]),
+        "r1": np.array([50, 60, 70]),
+        "r2": -40,
+        "CT": np.array([3, 4, 5]),
+    }
+
+    result = Lens.calculate_batch(known)
+
+    for row in range(3):
+        lens = Lens(**{v: float(np.broadcast_to(value, (3,))[row]) for v, value in known.items()})
+        lens.calculate()
+        for variable in Lens.variables:
+            assert isclose(result[variable][row], getattr(lens, variable), abs_tol=1e-12)
+
+
+def test_batch_unknown_variable():
+    """
+    Test that unknown variables aren't accepted.
+    """
+    with pytest.raises(ValueError):
+        Lens.calculate_batch({"n1": [1.0003], "wavelength": [550]})
+
+
+def test_batch_failing():
+    """
+    Test a combination of known variables which can't be calculated.
+    """
+    known = {v: [getattr(ORIGINAL_LENS, v)] for v in Lens.variables if v not in ("nL", "r1", "r2", "CT")}
+
+    with pytest.raises(ValueError) as exception_info:
+        Lens.calculate_batch(known)
+
+    assert str(exception_info.value).startswith("There has been a problem with the calculation.")
@@ -0,0 +1,99 @@
+import time
+
+import pytest
+
+pytest.importorskip("flask")
+
+import lenscalc_web.cache  # noqa: E402
+from lenscalc_web.app import app  # noqa: E402
+from lenscalc_web.cache import FileBackend, ResultCache, SQLiteBackend  # noqa: E402
+
+KNOWN = {"n1": 1.0003, "nL": 1.5, "n2": 1.0003, "r1": 50, "r2": -40, "CT": 3}
+
+
+def test_cache_tolerance():
+    """
+    Test that the values closer than the tolerance share the result.
+    """
+    cache = ResultCache(tolerance=1e-6)
+    cache.set(KNOWN, "result")
+
+    assert cache.get({**KNOWN, "r1": 50.000000001}) == "result"
+    assert cache.get({**KNOWN, "r1": 50.001}) is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "max_size": 1024}
+
+
+def test_cache_lru():
+    """
+    Test that the least recently used result is removed.
+    """
+    cache = ResultCache(max_size=2)
+    cache.set({"r1": 1}, 1)
+    cache.set({"r1": 2}, 2)
+    cache.get({"r1": 1})
+    cache.set({"r1": 3}, 3)
+
+    assert cache.get({"r1": 1}) == 1
+    assert cache.get({"r1": 2}) is None
+    assert cache.get({"r1": 3}) == 3
+
+
+def test_cache_ttl(monkeypatch):
+    """
+    Test that the results expire.
+    """
+    now = 1000
+    monkeypatch.setattr(lenscalc_web.cache.time, "time", lambda: now)
+    cache = ResultCache(ttl=10)
+    cache.set(KNOWN, "result")
+
+    now = 1005
+    assert cache.get(KNOWN) == "result"
+    now = 1011
+    assert cache.get(KNOWN) is None
+
+
+@pytest.mark.parametrize("backend", [FileBackend, SQLiteBackend])
+def test_cache_backend(tmp_path, backend):
+    """
+    Test that the caches share the results through the backend.
+    """
+    path = tmp_path / "cache"
+    ResultCache(backend=backend(path)).set(KNOWN, {"BFL": 44.08})
+    cache = ResultCache(backend=backend(path))
+
+    assert cache.get(KNOWN) == {"BFL": 44.08}
+    assert cache.get({"r1": 1}) is None
+
+
+def test_cache_api():
+    """
+    Test that the repeated lens is taken from the cache.
+    """
+    client = app.test_client()
+    before = client.get("/api/cache").get_json()
+    first = client.post("/api/solve", json={**KNOWN, "CT": 4}).get_json()
+    second = client.post("/api/solve", json={**KNOWN, "CT": 4}).get_json()
+    after = client.get("/api/cache").get_json()
+
+    assert first == second
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"] + 1
+
+
+@pytest.mark.parametrize("backend", [FileBackend, SQLiteBackend])
+def test_cache_backend_size(tmp_path, backend):
+    """
+    Test that the backend keeps at most `max_size` lenses, the oldest are removed.
+    """
+    cache = ResultCache(max_size=2, backend=backend(tmp_path / "cache"))
+    for r1 in (10, 20, 30):
+        cache.set({"r1": r1}, {"BFL": r1})
+        time.sleep(0.01)
+
+    shared = ResultCache(backend=backend(tmp_path / "cache"))
+    assert shared.get({"r1": 10}) is None
+    assert shared.get({"r1": 20}) == {"BFL": 20}
+    assert shared.get({"r1": 30}) == {"BFL": 30}
+    if backend is FileBackend:
+        assert len(list((tmp_path / "cache").glob("*.json"))) == 2
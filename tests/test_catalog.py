@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from lenscalc import Lens, LensCatalog, LensTable
+
+RANDOM = np.random.default_rng(0)
+SIZE = 5000
+TABLE = LensTable.from_columns({
+    "n1": 1.0003, "n2": 1.0003,
+    "nL": RANDOM.uniform(1.45, 1.9, SIZE),
+    "r1": RANDOM.uniform(10, 500, SIZE),
+    "r2": RANDOM.uniform(-500, -10, SIZE),
+    "CT": RANDOM.uniform(1, 10, SIZE),
+})
+CATALOG = LensCatalog(TABLE, scale={"CT": 0.1}, leaf_size=16)
+POINTS = np.column_stack([TABLE["EFL"], TABLE["BFL"], TABLE["CT"] / 0.1])
+
+
+@pytest.mark.parametrize("values", [
+    {"EFL": 100, "BFL": 97, "CT": 4},
+    {"EFL": 1e4, "BFL": 0, "CT": 40},
+])
+@pytest.mark.parametrize("k", [1, 20, 100])
+def test_catalog_nearest(values, k):
+    """
+    Test the nearest lenses against the distances to all the lenses.
+    """
+    indexes, distances = CATALOG.nearest(values, k)
+
+    expected = np.sqrt(np.sum((POINTS - [values["EFL"], values["BFL"], values["CT"] / 0.1]) ** 2, axis=1))
+    assert np.allclose(distances, np.sort(expected)[:k])
+    assert np.allclose(expected[indexes], distances)
+
+
+def test_catalog_within():
+    """
+    Test the lenses in the ranges against all the lenses.
+    """
+    indexes = CATALOG.within({"EFL": (90, 110), "CT": (None, 5)})
+
+    expected = np.flatnonzero((POINTS[:, 0] >= 90) & (POINTS[:, 0] <= 110) & (TABLE["CT"] <= 5))
+    assert len(expected) and np.array_equal(indexes, expected)
+    with pytest.raises(ValueError):
+        CATALOG.within({"D": (0, 1)})
+
+
+def test_catalog_save(tmp_path):
+    """
+    Test that the loaded catalog gives the same results.
+    """
+    lenses = [Lens(n1=1, nL=1.5, n2=1, r1=r1, r2=-40, CT=3) for r1 in range(20, 100)]
+    catalog = LensCatalog(lenses, columns=("EFL", "BFL"))
+    catalog.save(tmp_path)
+    loaded = LensCatalog.load(tmp_path)
+
+    indexes, _ = loaded.nearest({"EFL": 50, "BFL": 48}, 3)
+    assert np.array_equal(indexes, catalog.nearest({"EFL": 50, "BFL": 48}, 3)[0])
+    assert loaded.table[int(indexes[0])].r1 == lenses[indexes[0]].r1
+    assert np.array_equal(loaded.within({"EFL": (40, 60)}), catalog.within({"EFL": (40, 60)}))
+    assert not loaded.table.known.flags.owndata
+
+
+def test_catalog_empty():
+    """
+    Test the catalogs without any lenses which can be found.
+    """
+    empty = LensCatalog([])
+    # The lenses without CT can't be calculated.
+    invalid = LensCatalog(LensTable.from_columns({"n1": 1, "nL": 1.5, "n2": 1, "r1": [50, 60], "r2": -40}))
+
+    for catalog in (empty, invalid):
+        indexes, distances = catalog.nearest({"EFL": 50, "BFL": 48, "CT": 3}, 3)
+        assert len(indexes) == len(distances) == 0
+        assert len(catalog.within({"EFL": (40, 60)})) == 0
+    assert len(invalid) == 2
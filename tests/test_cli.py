@@ -0,0 +1,73 @@
+import csv
+import json
+
+from lenscalc import Lens
+from lenscalc.cli import main
+from test_variable_combinations import compare_two_lenses, ORIGINAL_LENS
+
+INPUT = """id,n1,nL,n2,r1,r2,CT,BFL
+a,1.0003,1.5,1.0003,50,-40,3,
+b,1.0003,1.5,1.0003,,-40,3,44.0848506784985
+c,1.0003,1.5,1.0003,,-40,,
+d,1.0003,x,1.0003,50,-40,3,
+"""
+
+
+def values(record):
+    """
+    Return a lens with the values from the output `record`.
+    """
+    return Lens(**{v: None if record[v] in ("", None) else float(record[v]) for v in Lens.variables})
+
+
+def test_solve_csv(tmp_path):
+    """
+    Test calculation of lenses from a CSV file.
+    """
+    (tmp_path / "input.csv").write_text(INPUT)
+    main(["solve", str(tmp_path / "input.csv"), "-o", str(tmp_path / "output.csv"), "--chunk-size", "3"])
+
+    with open(tmp_path / "output.csv", newline="") as file:
+        records = list(csv.DictReader(file))
+
+    assert [record["id"] for record in records] == ["a", "b", "c", "d"]
+    assert compare_two_lenses(ORIGINAL_LENS, values(records[0]))
+    assert compare_two_lenses(ORIGINAL_LENS, values(records[1]))
+    assert records[0]["error"] == records[1]["error"] == ""
+    assert records[2]["error"] == "The known variables don't determine the lens!"
+    assert records[3]["error"].startswith("nL:")
+
+
+def test_solve_jsonl_workers(tmp_path):
+    """
+    Test calculation of lenses from a JSONL file in more processes.
+    """
+    lines = [json.dumps({"n1": 1.0003, "nL": 1.5, "n2": 1.0003, "r1": 50, "r2": -40, "CT": 3})] * 5
+    (tmp_path / "input.jsonl").write_text("\n".join(lines))
+    main(["solve", str(tmp_path / "input.jsonl"), "-o", str(tmp_path / "output.jsonl"), "--workers", "2"])
+
+    records = [json.loads(line) for line in (tmp_path / "output.jsonl").read_text().splitlines()]
+
+    assert len(records) == 5
+    for record in records:
+        assert record["error"] == ""
+        assert compare_two_lenses(ORIGINAL_LENS, values(record))
+
+
+def test_solve_jsonl_to_csv_mixed_keys(tmp_path):
+    """
+    Test that the extra values of JSONL records with different keys
+    stay in their columns of the CSV output.
+    """
+    lens = {"n1": 1.0003, "nL": 1.5, "n2": 1.0003, "r1": 50, "r2": -40, "CT": 3}
+    lines = [json.dumps({"id": "a", **lens}), json.dumps({"name": "x", **lens, "id": "b"})]
+    (tmp_path / "input.jsonl").write_text("\n".join(lines))
+    main(["solve", str(tmp_path / "input.jsonl"), "-o", str(tmp_path / "output.csv")])
+
+    with open(tmp_path / "output.csv", newline="") as file:
+        records = list(csv.DictReader(file))
+
+    assert list(records[0])[0] == "id"
+    assert [record["id"] for record in records] == ["a", "b"]
+    for record in records:
+        assert compare_two_lenses(ORIGINAL_LENS, values(record))
@@ -0,0 +1,53 @@
+import importlib.util
+
+import lenscalc.lens
+from lenscalc import Lens
+from lenscalc.codegen import generate
+from test_variable_combinations import compare_two_lenses, ORIGINAL_LENS
+
+KNOWN_SETS = [
+    (frozenset(("n1", "nL", "n2", "r1", "r2", "CT")), True),
+    (frozenset(("D1", "nL", "n2", "r1", "r2", "CT")), False),
+    (frozenset(("D1", "D2", "D", "n1", "n2", "P1")), False),
+]
+
+
+def load_solvers(tmp_path):
+    """
+    Generate the solvers for `KNOWN_SETS` and import them.
+    """
+    path = tmp_path / "solvers.py"
+    generate(path, known_sets=KNOWN_SETS)
+
+    spec = importlib.util.spec_from_file_location("solvers", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_generated_module(tmp_path):
+    """
+    Test that the generated module contains the solvers and the errors.
+    """
+    module = load_solvers(tmp_path)
+
+    assert len(module.SOLVERS) == 2
+    assert len(module.ERRORS) == 1
+    assert Lens._mask(*KNOWN_SETS[0]) in module.SOLVERS
+    assert Lens._mask(*KNOWN_SETS[2]) in module.ERRORS
+
+
+def test_generated_solver(tmp_path, monkeypatch):
+    """
+    Test that `Lens.calculate` uses the generated solvers.
+    """
+    module = load_solvers(tmp_path)
+    monkeypatch.setattr(lenscalc.lens, "SOLVERS", module.SOLVERS)
+    monkeypatch.setattr(Lens, "_plans", {})
+
+    lens = Lens(n1=1.0003, nL=1.5, n2=1.0003, r1=50, r2=-40, CT=3)
+    lens.calculate()
+
+    assert compare_two_lenses(ORIGINAL_LENS, lens)
+    plan = Lens._plans[KNOWN_SETS[0]]
+    assert plan.function is module.SOLVERS[Lens._mask(*KNOWN_SETS[0])][1]
@@ -0,0 +1,80 @@
+import sys
+from copy import copy
+
+import pytest
+
+from lenscalc import CompactLens
+from test_variable_combinations import compare_two_lenses, ORIGINAL_LENS
+
+
+def test_compact_calculation():
+    """
+    Test that the compact lens is calculated the same as the lens
+    and that the results are plain floats.
+    """
+    lens = CompactLens(n1=1.0003, nL=1.5, n2=1.0003, r1=50, r2=-40, CT=3)
+    lens.calculate()
+
+    assert compare_two_lenses(ORIGINAL_LENS, lens)
+    assert all(type(getattr(lens, variable)) is float for variable in lens.variables)
+
+
+def test_compact_symbolic_fallback():
+    """
+    Test that the results of SymPy are stored as floats.
+
+    The lens has the same n1 and n2, which are calculated,
+    so the plan isn't used.
+    """
+    lens = CompactLens(D1=0.009994, nL=1.5, n2=1.0003, r1=50, r2=-40, CT=3)
+    lens.calculate()
+
+    assert compare_two_lenses(ORIGINAL_LENS, lens)
+    assert type(lens.NPS) is float
+
+
+def test_compact_strings():
+    """
+    Test that strings are converted to floats and None means missing value.
+    """
+    lens = CompactLens(n1="1.0003")
+    lens.nL = "1.5"
+    lens.n2 = None
+
+    assert lens.n1 == 1.0003
+    assert lens.nL == 1.5
+    assert lens.n2 is None
+    assert lens.replacements == {"n1": 1.0003, "nL": 1.5}
+
+
+def test_compact_size():
+    """
+    Test that the compact lens has no `__dict__` and it is smaller than the lens.
+    """
+    compact = CompactLens(**ORIGINAL_LENS._calculate_replacements())
+
+    with pytest.raises(AttributeError):
+        compact.extra = "extra"
+
+    compact_size = sys.getsizeof(compact) + sys.getsizeof(compact._values)
+    lens_size = sys.getsizeof(ORIGINAL_LENS) + sys.getsizeof(ORIGINAL_LENS.__dict__)
+    assert compact_size < lens_size
+
+
+def test_compact_copy():
+    """
+    Test that the copy of the compact lens doesn't share the values.
+    """
+    lens = CompactLens(n1=1.0003)
+    lens_copy = copy(lens)
+    lens_copy.n1 = 1.5
+
+    assert lens.n1 == 1.0003
+
+
+def test_compact_unknown_variable():
+    """
+    Test that unknown variables can't be given.
+    """
+    with pytest.raises(TypeError):
+        CompactLens(n3=1)
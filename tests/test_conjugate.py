@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from sympy import Rational
+
+from lenscalc import ConjugateLens, Lens
+
+KNOWN = {"n1": 1.0003, "nL": 1.5, "n2": 1.33, "r1": 50, "r2": -40, "CT": 3}
+
+
+def test_image():
+    """
+    Test the images against the conjugate lenses calculated one by one
+    and against the focal points.
+    """
+    lens = Lens(**KNOWN)
+    lens.calculate()
+    distances = np.array([-200, -100, -30, 20])
+    images = lens.image(distances)
+
+    for index, distance in enumerate(distances):
+        conjugate = ConjugateLens(**KNOWN, OD=distance)
+        conjugate.calculate()
+        for variable in ("ID", "LM", "AM"):
+            assert images[variable][index] == pytest.approx(float(getattr(conjugate, variable)))
+
+    far = Lens(**KNOWN).image(-1e12)
+    assert far["ID"] == pytest.approx(lens.BFL)
+    assert far["LM"] * far["AM"] == pytest.approx(KNOWN["n1"] / KNOWN["n2"])
+
+
+def test_image_after_change():
+    """
+    Test that the images are calculated from the changed lens.
+    """
+    lens = Lens(**KNOWN)
+    lens.calculate()
+    lens.image(-100)
+    lens.CT = 10
+
+    changed = Lens(**{**KNOWN, "CT": 10})
+    assert lens.image(-100)["ID"] == pytest.approx(changed.image(-100)["ID"], rel=1e-12)
+    assert changed.image(-100)["ID"] != pytest.approx(Lens(**KNOWN).image(-100)["ID"], rel=1e-12)
+
+
+def test_conjugate_lens_numeric():
+    """
+    Test the lens with the given magnification.
+    """
+    lens = ConjugateLens(n1=1, nL=1.5, n2=1, r2=-40, CT=3, OD=-100, LM=-1)
+    lens.calculate(method="numeric")
+
+    check = Lens(n1=1, nL=1.5, n2=1, r1=lens.r1, r2=-40, CT=3)
+    images = check.image(-100)
+    assert images["LM"] == pytest.approx(-1)
+    assert images["ID"] == pytest.approx(lens.ID)
+
+
+@pytest.mark.parametrize("number", [float, Rational])
+def test_conjugate_lens_symbolic_degenerate(number):
+    """
+    Test that the degenerate symbolic solution of the lens with the given
+    magnification isn't returned (n1 and n2 are the same, so the symbolic
+    solution divides zero by zero).
+    """
+    known = {"n1": 1, "nL": 1.5, "n2": 1, "r2": -40, "CT": 3, "OD": -100, "LM": -1}
+    lens = ConjugateLens(**{variable: number(str(value)) for variable, value in known.items()})
+
+    with pytest.raises(ValueError) as exception_info:
+        lens.calculate()
+
+    assert str(exception_info.value).startswith("There has been a problem with the calculation.")
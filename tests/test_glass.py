@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from lenscalc import Lens
+from lenscalc.glass import Glass, GlassCatalog
+
+CATALOG = GlassCatalog.load(Path(__file__).parent / "glasses.csv")
+WAVELENGTHS = np.array([0.4861327, 0.5875618, 0.6562725])  # F, d and C lines
+
+
+def test_glass_indexes():
+    """
+    Test the refractive indexes against the values from the datasheets.
+    """
+    assert CATALOG.index("N-BK7", 0.5875618) == pytest.approx(1.5168, abs=1e-5)
+    assert CATALOG["N-SF11"].index(0.5875618) == pytest.approx(1.78472, abs=1e-5)
+    assert np.all(np.diff(CATALOG["N-SF11"].index(WAVELENGTHS)) < 0)
+    assert CATALOG.index("Example", 0.5) == pytest.approx(1.5046 + 0.0042 / 0.25)
+
+    indexes = CATALOG.indexes(CATALOG.names, WAVELENGTHS)
+    assert indexes.shape == (len(CATALOG), 3)
+    assert CATALOG.indexes(CATALOG.names, WAVELENGTHS) is indexes
+    assert np.array_equal(indexes[1], CATALOG["N-SF11"].index(WAVELENGTHS))
+
+    with pytest.raises(ValueError):
+        Glass("Wrong", "sellmeier", [1, 2, 3])
+
+
+def test_calculate_spectrum():
+    """
+    Test the lens calculated for more wavelengths and glasses
+    against the lenses calculated one by one.
+    """
+    lens = Lens(n1=1.0003, n2=1.0003, r1=50, r2=-40, CT=3)
+    spectrum = lens.calculate_spectrum(WAVELENGTHS, nL=CATALOG["N-BK7"])
+    glasses = lens.calculate_spectrum(WAVELENGTHS, nL=CATALOG.indexes(CATALOG.names, WAVELENGTHS))
+
+    for index, wavelength in enumerate(WAVELENGTHS):
+        single = Lens(n1=1.0003, nL=CATALOG.index("N-BK7", wavelength), n2=1.0003, r1=50, r2=-40, CT=3)
+        single.calculate()
+        assert spectrum["EFL"][index] == pytest.approx(single.EFL)
+        assert spectrum["BFL"][index] == pytest.approx(single.BFL)
+    assert glasses["EFL"].shape == (len(CATALOG), 3)
+    assert np.array_equal(glasses["EFL"][0], spectrum["EFL"])
+    assert lens.EFL is None
+
+    with pytest.raises(ValueError):
+        lens.calculate_spectrum(WAVELENGTHS, r1=CATALOG["N-BK7"])
+
+
+def test_calculate_spectrum_lists():
+    """
+    Test that the wavelengths and indexes can be plain lists.
+    """
+    lens = Lens(n1=1.0003, n2=1.0003, r1=50, r2=-40, CT=3)
+
+    result = lens.calculate_spectrum([0.5, 0.6], nL=[1.5, 1.6])
+    expected = lens.calculate_spectrum(np.array([0.5, 0.6]), nL=np.array([1.5, 1.6]))
+
+    assert np.array_equal(result["EFL"], expected["EFL"])
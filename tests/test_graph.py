@@ -0,0 +1,58 @@
+from lenscalc import Lens
+
+
+def test_graph_variables():
+    """
+    Test that the graph knows which variables are in which equations.
+    """
+    graph = Lens._graph
+
+    assert graph.equation_variables[0] == {"D1", "nL", "n1", "r1"}
+    assert graph.variable_equations["EFL"] == (5, 6, 7)
+
+
+def test_graph_blocks():
+    """
+    Test splitting equations into blocks solved one after another.
+
+    D2 is found first from its own equation, then D and CT together
+    from the equations of D and P2 and at last P1.
+    """
+    graph = Lens._graph
+
+    blocks = graph.blocks([1, 2, 3, 4], {"D2", "D", "CT", "P1"})
+
+    assert [(equations, set(variables)) for equations, variables in blocks] == [
+        ((1,), {"D2"}),
+        ((2, 4), {"D", "CT"}),
+        ((3,), {"P1"}),
+    ]
+
+
+def test_graph_blocks_singular():
+    """
+    Test that equations without one equation for every unknown aren't split.
+    """
+    graph = Lens._graph
+
+    assert graph.blocks([0, 1], {"D1", "nL", "r1"}) is None
+    assert graph.blocks([0, 5], {"nL", "r1"}) is None
+
+
+def test_graph_structure():
+    """
+    Test finding whether the known variables determine the lens
+    without solving the equations.
+    """
+    assert Lens.structure(["n1", "nL", "n2", "r1", "r2", "CT"]) == ("determined", 0, (), ())
+
+    structure = Lens.structure(["EFL", "f1", "f2", "n1", "nL", "n2"])
+    assert structure.status == "under-determined"
+    assert structure.missing == 2
+    assert {"r1", "r2", "CT"} <= set(structure.undetermined)
+    # f1 and f2 follow from n1, n2 and EFL.
+    assert set(structure.redundant) == {"n1", "n2", "f1", "f2", "EFL"}
+
+    structure = Lens.structure(set(Lens.variables) - {"nL", "r1", "r2", "CT"})
+    assert structure.status == "over-determined"
+    assert structure.undetermined == ()
@@ -0,0 +1,88 @@
+from math import isclose
+
+import pytest
+from sympy import Rational
+
+from lenscalc import Lens, profiling
+from test_variable_combinations import compare_two_lenses
+
+KNOWN = {"n1": 1.0003, "nL": 1.5, "n2": 1.0003, "r1": 50, "r2": -40, "CT": 3}
+
+
+def test_recalculate_changed():
+    """
+    Test that the lens is calculated again after a change of a given value.
+    """
+    lens = Lens(**KNOWN)
+    lens.calculate()
+    lens.CT = 5
+    lens.calculate()
+
+    expected = Lens(**{**KNOWN, "CT": 5})
+    expected.calculate()
+    assert compare_two_lenses(expected, lens)
+
+
+def test_recalculate_only_affected():
+    """
+    Test that changing CT doesn't calculate D1 and D2 again.
+    """
+    lens = Lens(**{variable: Rational(str(value)) for variable, value in KNOWN.items()})
+    lens.calculate()
+    D1, D2 = lens.D1, lens.D2
+
+    lens.CT = Rational(5)
+    with profiling.profile() as profile:
+        lens.calculate()
+
+    assert profile.single == 9
+    assert lens.D1 is D1 and lens.D2 is D2
+    assert lens.D == lens.D1 + lens.D2 - lens.D1 * lens.D2 * (lens.CT / lens.nL)
+
+
+def test_recalculate_inverse():
+    """
+    Test that a calculated value can be given and a given value calculated.
+    """
+    lens = Lens(**KNOWN)
+    lens.calculate()
+    lens.r1 = None
+    lens.BFL = 45
+
+    lens.calculate()
+
+    expected = Lens(**{**KNOWN, "r1": None, "BFL": 45})
+    expected.calculate()
+    assert compare_two_lenses(expected, lens)
+    assert isclose(lens.BFL, 45)
+
+
+def test_recalculate_without_changes(capsys):
+    """
+    Test that nothing is calculated if nothing was changed.
+    """
+    lens = Lens(**KNOWN)
+    lens.calculate()
+    with profiling.profile() as profile:
+        lens.calculate()
+
+    assert profile.paths == {None: 1}
+    assert capsys.readouterr().out == ""
+
+
+def test_recalculate_over_determined():
+    """
+    Test that a calculated value can't be given without removing
+    a given one, the lens would be inconsistent.
+    """
+    lens = Lens(**KNOWN)
+    lens.calculate()
+    lens.EFL = 100
+
+    with pytest.raises(ValueError) as exception_info:
+        lens.calculate()
+
+    assert str(exception_info.value).startswith("The given variables over-determine the lens")
+    lens.CT = None
+    lens.calculate()
+    assert isclose(lens.D, 1 / 100)
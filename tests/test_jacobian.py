@@ -0,0 +1,56 @@
+import pytest
+
+from lenscalc import CompactLens, Lens
+
+KNOWN = {"n1": 1.0003, "nL": 1.5, "n2": 1.0003, "r1": 50, "r2": -40, "CT": 3}
+
+
+def finite_differences(known, step=1e-6):
+    """
+    Return the derivatives of the calculated variables
+    using the central differences.
+    """
+    result = {}
+    for given in known:
+        lenses = []
+        for sign in (1, -1):
+            lens = Lens(**{**known, given: known[given] + sign * step})
+            lens.calculate()
+            lenses.append(lens)
+        for variable in Lens.variables:
+            if variable not in known:
+                result.setdefault(variable, {})[given] = (getattr(lenses[0], variable) - getattr(lenses[1], variable)) / (2 * step)
+    return result
+
+
+@pytest.mark.parametrize("known", [
+    KNOWN,
+    {"n1": 1.0003, "nL": 1.5, "n2": 1.0003, "EFL": 50, "r2": -40, "CT": 3},
+    {"n1": 1.0003, "nL": 1.5, "n2": 1.33, "BFL": 40, "r1": 50, "CT": 3},
+])
+def test_jacobian(known):
+    """
+    Test the derivatives against the finite differences.
+    """
+    lens = Lens(**known)
+    jacobian = lens.calculate(jacobian=True)
+
+    expected = finite_differences(known)
+    assert set(jacobian) == set(expected)
+    for variable, derivatives in expected.items():
+        assert jacobian[variable] == pytest.approx(derivatives, rel=1e-5, abs=1e-6)
+
+
+def test_jacobian_recalculation():
+    """
+    Test that the derivatives are with respect to the given variables
+    after a variable is changed and for the compact lens.
+    """
+    lens = Lens(**KNOWN)
+    lens.calculate()
+    lens.CT = 4
+    jacobian = lens.calculate(jacobian=True)
+
+    assert set(jacobian["BFL"]) == set(KNOWN)
+    assert jacobian == CompactLens(**{**KNOWN, "CT": 4}).calculate(jacobian=True)
+    assert lens.calculate() is None
@@ -0,0 +1,114 @@
+from copy import deepcopy
+from math import isclose
+
+import pytest
+
+from lenscalc import Lens
+from test_variable_combinations import compare_two_lenses
+
+# This lens was compared to the result from the original calculator.
+WATER_LENS = Lens(
+    D1=0.00999400000000000,
+    D2=0.00425000000000000,
+    D=0.0141590510000000,
+    n1=1.0003,
+    nL=1.5,
+    n2=1.33,
+    r1=50,
+    r2=-40,
+    CT=3,
+    P1=0.600502816184503,
+    P2=-1.87752978642425,
+    f1=-70.6473901393533,
+    f2=93.9328490306307,
+    EFL=70.6262022786697,
+    FFL=-70.0468873231688,
+    BFL=92.0553192442064,
+    NPS=23.2854588912774
+)
+
+
+def test_numeric():
+    """
+    Test the numeric calculation of a lens.
+    """
+    lens = Lens(n1=1.0003, nL=1.5, n2=1.33, r1=50, r2=-40, CT=3)
+
+    lens.calculate(method="numeric")
+
+    assert compare_two_lenses(WATER_LENS, lens)
+    assert lens.convergence.converged
+    assert lens.convergence.rank == 11
+
+
+def test_numeric_large_radii():
+    """
+    Test that the rank and the convergence don't depend on the units,
+    the lens with large radii is determined as well as a small one.
+    """
+    lens = Lens(n1=1.0003, nL=1.5, n2=1.33, r1=5000, r2=-4000, CT=3)
+    scaled = Lens(n1=1.0003, nL=1.5, n2=1.33, r1=50e-6, CT=3e-6, BFL=92.0553192442064e-6)
+
+    lens.calculate(method="numeric")
+    scaled.calculate(method="numeric")
+
+    assert lens.convergence.converged
+    assert lens.convergence.rank == 11
+    assert scaled.convergence.rank == 11
+    assert isclose(scaled.r2, -40e-6)
+
+
+def test_numeric_back_focal_length():
+    """
+    Test finding the radius for the desired back focal length.
+
+    The equations for the focal lengths have to be solved together.
+    """
+    lens = Lens(n1=1.0003, nL=1.5, n2=1.33, r1=50, CT=3, BFL=92.0553192442064)
+
+    lens.calculate(method="numeric")
+
+    assert isclose(lens.r2, -40)
+    assert lens.convergence.converged
+    assert lens.convergence.iterations > 0
+
+
+def test_numeric_not_unique():
+    """
+    Test a combination which can't be calculated symbolically.
+
+    The numeric solution finds one of the lenses and reports
+    that the solution isn't unique.
+    """
+    lens = deepcopy(WATER_LENS)
+    for variable in ("nL", "r1", "r2", "CT"):
+        setattr(lens, variable, None)
+
+    lens.calculate(method="numeric")
+
+    assert lens.convergence.converged
+    assert lens.convergence.rank < 4
+    assert isclose(lens.D1, (lens.nL - lens.n1) / lens.r1)
+    assert isclose(lens.D, lens.D1 + lens.D2 - lens.D1 * lens.D2 * (lens.CT / lens.nL))
+
+
+def test_numeric_not_converging():
+    """
+    Test that a lens without a solution isn't calculated.
+    """
+    lens = Lens(n1=1.0003, n2=1.0003, r1=50, r2=-40, CT=3, NPS=10)
+
+    with pytest.raises(ValueError):
+        lens.calculate(method="numeric")
+
+    assert not lens.convergence.converged
+
+
+def test_unknown_method():
+    """
+    Test calculation with an unknown method.
+    """
+    lens = Lens(n1=1.0003, nL=1.5, n2=1.0003, r1=50, r2=-40, CT=3)
+
+    with pytest.raises(ValueError):
+        lens.calculate(method="magic")
@@ -0,0 +1,48 @@
+from math import isclose
+
+import pytest
+
+import lenscalc
+from lenscalc import Lens
+
+BASE = Lens(n1=1.0003, nL=1.5, n2=1.0003, r1=50, r2=-40, CT=3)
+BOUNDS = {"r1": (10, 300), "r2": (-300, -10), "CT": (1, 10)}
+
+
+def test_design_targets():
+    """
+    Test that the designed lens has the target values and is in the bounds.
+    """
+    result = lenscalc.design({"EFL": 100, "BFL": 97}, BOUNDS, BASE)
+
+    assert result.success
+    assert isclose(result.lens.EFL, 100) and isclose(result.lens.BFL, 97)
+    assert all(low <= getattr(result.lens, v) <= high for v, (low, high) in BOUNDS.items())
+    assert result.lens.nL == 1.5
+
+
+def test_design_ranges():
+    """
+    Test the targets given as ranges and the refractive index as a free variable.
+    """
+    bounds = {"r1": (10, 300), "r2": (-300, 300), "nL": (1.4, 1.9)}
+    result = lenscalc.design({"EFL": (99, 101), "BFL": (90, 95)}, bounds, BASE)
+
+    assert result.success
+    assert 99 - 1e-6 <= result.lens.EFL <= 101 + 1e-6
+    assert 90 - 1e-6 <= result.lens.BFL <= 95 + 1e-6
+
+
+def test_design_impossible():
+    """
+    Test the targets which can't be reached and the wrong arguments.
+    """
+    # The principal plane can't be so far from the lens with these radii.
+    result = lenscalc.design({"EFL": 80, "BFL": 75}, {"r1": (10, 300), "r2": (-300, -10)}, BASE)
+    assert not result.success
+    assert result.residual > 1e-3
+
+    with pytest.raises(ValueError):
+        lenscalc.design({"r1": 80}, BOUNDS, BASE)
+    with pytest.raises(ValueError, match="don't determine"):
+        lenscalc.design({"EFL": 80}, BOUNDS, {"n1": 1})
@@ -0,0 +1,53 @@
+import pytest
+
+from lenscalc import Lens
+from lenscalc.parallel import signature, solve_many, warm_up
+from test_variable_combinations import compare_two_lenses, ORIGINAL_LENS
+
+KNOWN = {"n1": 1.0003, "nL": 1.5, "n2": 1.0003, "r1": 50, "r2": -40, "CT": 3}
+
+
+def test_solve_many_ordered():
+    """
+    Test that the lenses are calculated in the order of the records.
+    """
+    records = [{**KNOWN, "CT": CT} for CT in range(1, 8)]
+    lenses = list(solve_many(records, workers=2, chunk_size=2))
+
+    assert [lens.CT for lens in lenses] == list(range(1, 8))
+    assert compare_two_lenses(ORIGINAL_LENS, lenses[2])
+
+
+def test_solve_many_unordered():
+    """
+    Test that the lenses are yielded with the indexes of the records.
+    """
+    records = [{**KNOWN, "CT": CT} for CT in range(1, 8)]
+    results = dict(solve_many(iter(records), workers=2, ordered=False, chunk_size=3))
+
+    assert sorted(results) == list(range(7))
+    assert all(results[index].CT == index + 1 for index in results)
+
+
+def test_solve_many_errors():
+    """
+    Test that the errors are raised or returned.
+    """
+    records = [KNOWN, {}]
+
+    with pytest.raises(ValueError, match="No variables were given!"):
+        list(solve_many(records, workers=1))
+
+    lens, error = solve_many(records, workers=1, errors="return")
+    assert compare_two_lenses(ORIGINAL_LENS, lens)
+    assert isinstance(error, ValueError)
+
+
+def test_warm_up(monkeypatch):
+    """
+    Test that the warm-up compiles the solution for the signature.
+    """
+    monkeypatch.setattr(Lens, "_plans", {})
+    warm_up([signature(KNOWN)])
+
+    assert (frozenset(KNOWN), True) in Lens._plans
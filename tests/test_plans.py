@@ -0,0 +1,69 @@
+from copy import deepcopy
+
+import pytest
+from sympy import zoo  # complex infinity in SymPy
+
+from lenscalc import Lens
+from test_variable_combinations import compare_two_lenses, ORIGINAL_LENS
+
+
+def test_plan_result():
+    """
+    Test that a lens with float input is calculated by a plan.
+
+    The result should be in native floats.
+    """
+    lens = Lens(n1=1.0003, nL=1.5, n2=1.0003, r1=50, r2=-40, CT=3)
+
+    lens.calculate()
+
+    assert compare_two_lenses(ORIGINAL_LENS, lens)
+    assert type(lens.EFL) is float
+    assert type(lens.NPS) is float
+
+
+def test_plan_reused():
+    """
+    Test that the plan is compiled only once for the same known variables.
+    """
+    lens = Lens(nL=1.5, n2=1.0003, r1=50, r2=-40, CT=3, f1=-44.9839906842963)
+    lens.calculate()
+
+    plans = dict(Lens._plans)
+
+    lens = Lens(nL=1.6, n2=1.0003, r1=60, r2=-30, CT=4, f1=-40)
+    lens.calculate()
+
+    assert Lens._plans == plans
+
+
+def test_plan_failing():
+    """
+    Test that a failing combination is remembered by its plan.
+    """
+    for _ in range(2):
+        lens = deepcopy(ORIGINAL_LENS)
+        for variable in ("nL", "r1", "r2", "CT"):
+            setattr(lens, variable, None)
+
+        with pytest.raises(ValueError) as exception_info:
+            lens.calculate()
+
+        assert str(exception_info.value).startswith("There has been a problem with the calculation.")
+
+    known = frozenset(v for v in Lens.variables if v not in ("nL", "r1", "r2", "CT"))
+    assert Lens._plan(known, True).error is not None
+
+
+def test_plan_division_by_zero():
+    """
+    Test that a lens the plan can't evaluate is calculated by SymPy.
+
+    All indexes are the same, so the power of the lens is zero.
+    """
+    lens = Lens(n1=1.5, nL=1.5, n2=1.5, r1=50, r2=-40, CT=3)
+
+    lens.calculate()
+
+    assert lens.D == 0
+    assert lens.EFL == zoo
@@ -0,0 +1,81 @@
+import pytest
+from sympy import Float
+
+from lenscalc import CompactLens, Lens, profiling
+
+KNOWN = {"n1": 1.0003, "nL": 1.5, "n2": 1.0003, "r1": 50, "r2": -40, "CT": 3}
+
+
+def test_profiling_off():
+    """
+    Test that the calculations aren't measured without callbacks.
+    """
+    assert profiling.measure() is profiling._off
+
+    with profiling.profile():
+        assert isinstance(profiling.measure(), profiling.Timer)
+
+    assert profiling.measure() is profiling._off
+
+
+def test_profiling_plan():
+    """
+    Test measuring the calculation with the compiled plan.
+    """
+    with profiling.profile() as profile:
+        Lens(**KNOWN).calculate()
+        CompactLens(**KNOWN).calculate()
+
+    assert profile.calculations == 2
+    assert profile.paths == {"plan": 2}
+    assert {"replacements", "plan", "evaluate_plan"} <= set(profile.phases)
+    assert profile.single == profile.simultaneous == 0
+
+
+def test_profiling_symbolic():
+    """
+    Test measuring the symbolic calculation.
+
+    The equations for the focal lengths have to be solved together.
+    """
+    lens = Lens(**{**KNOWN, "n1": Float("1.0003"), "r2": None, "BFL": 44.0848506784985})
+    with profiling.profile() as profile:
+        lens.calculate()
+
+    assert profile.paths == {"symbolic": 1}
+    assert {"solve", "subs", "solve_simultaneous"} <= set(profile.phases)
+    assert profile.single > 0
+    assert profile.simultaneous > 0
+
+
+def test_profiling_error():
+    """
+    Test that the failed calculations are counted.
+    """
+    with profiling.profile() as profile:
+        with pytest.raises(ValueError):
+            Lens().calculate()
+
+    assert profile.errors == {"ValueError": 1}
+    assert "lenscalc_errors_total{error=\"ValueError\"} 1" in profile.prometheus()
+
+
+def test_profiling_web(monkeypatch):
+    """
+    Test the metrics of the web app.
+    """
+    pytest.importorskip("flask")
+    from lenscalc_web.app import app
+
+    monkeypatch.setitem(app.config, "PROFILING", True)
+    monkeypatch.delitem(app.extensions, "lenscalc_solver", raising=False)
+    client = app.test_client()
+    try:
+        client.post("/api/solve", json={**KNOWN, "CT": 5})
+        text = client.get("/metrics").get_data(as_text=True)
+    finally:
+        profiling.remove_callback(app.extensions.pop("lenscalc_profile"))
+        app.extensions.pop("lenscalc_solver")
+
+    assert "lenscalc_calculations_total 1" in text
+    assert "lenscalc_cache_misses" in text
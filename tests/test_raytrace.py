@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import lenscalc
+from lenscalc import Lens, LensSystem
+from lenscalc.raytrace import trace_chunks
+
+LENS = Lens(n1=1.0003, nL=1.5, n2=1.33, r1=50, r2=-40, CT=3)
+LENS.calculate()
+
+
+def test_trace_focal_lengths():
+    """
+    Test that the parallel rays meet at the back focal point
+    and that the rays from the front focal point leave parallel.
+    """
+    traced = lenscalc.trace(LENS, [1, 2, -3], 0, planes=[0, LENS.BFL])
+    assert np.allclose(traced.heights[1], 0)
+
+    traced = lenscalc.trace(LENS, 0, [0.01, -0.02], start=LENS.FFL)
+    assert np.allclose(traced.angles, 0)
+
+
+def test_trace_system():
+    """
+    Test the rays traced through a system with two lenses
+    against the focal point of the system and in chunks.
+    """
+    second = Lens(n1=1.33, nL=1.7, n2=1, r1=-60, r2=-100, CT=2)
+    system = LensSystem([LENS, second], gaps=[4])
+    system.calculate()
+    heights = np.linspace(-5, 5, 101)
+
+    traced = lenscalc.trace(system, heights, 0, planes=[system.BFL], chunk_size=7)
+    assert np.allclose(traced.heights, 0)
+
+    chunks = list(trace_chunks(system, [(heights[:50], 0.01), (heights[50:], 0.01)], planes=[0, 10]))
+    traced = lenscalc.trace(system, heights, 0.01, planes=[0, 10])
+    assert np.array_equal(np.hstack([chunk.heights for chunk in chunks]), traced.heights)
+    assert np.allclose(traced.heights[1], traced.heights[0] + 10 * traced.angles)
+
+    variants = {"n1": 1.0003, "nL": 1.5, "n2": 1.33, "r1": [50, 60], "r2": -40, "CT": 3}
+    with pytest.raises(ValueError):
+        lenscalc.trace(LensSystem([variants]), heights, 0)
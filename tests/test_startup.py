@@ -0,0 +1,49 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from lenscalc.codegen import generate
+from test_codegen import KNOWN_SETS
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run(code):
+    """
+    Run the `code` in a new Python process and return its output.
+    """
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout.split()
+
+
+def test_import_without_sympy():
+    """
+    Test that importing lenscalc doesn't import SymPy and NumPy.
+    """
+    output = run("import sys, lenscalc; print('sympy' in sys.modules, 'numpy' in sys.modules)")
+
+    assert output == ["False", "False"]
+
+
+def test_generated_solver_without_sympy(tmp_path):
+    """
+    Test that the lens given by numbers is calculated by the generated
+    solver without importing SymPy.
+    """
+    path = tmp_path / "solvers.py"
+    generate(path, known_sets=KNOWN_SETS)
+
+    output = run(
+        "import importlib.util, sys\n"
+        "import lenscalc.lens\n"
+        f"spec = importlib.util.spec_from_file_location('solvers', {str(path)!r})\n"
+        "solvers = importlib.util.module_from_spec(spec)\n"
+        "spec.loader.exec_module(solvers)\n"
+        "lenscalc.lens.SOLVERS = solvers.SOLVERS\n"
+        "lens = lenscalc.Lens(n1=1.0003, nL=1.5, n2=1.0003, r1=50, r2=-40, CT=3)\n"
+        "lens.calculate()\n"
+        "print('sympy' in sys.modules, round(lens.BFL, 6))"
+    )
+
+    assert output == ["False", "44.084851"]
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+import lenscalc
+from lenscalc import CompactLens, Lens, LensTable
+from test_variable_combinations import compare_two_lenses
+
+KNOWN = {"n1": 1.0003, "nL": 1.5, "n2": 1.0003, "r1": 50, "r2": -40, "CT": 3}
+
+
+def test_sweep_grid():
+    """
+    Test that the grid of the values is calculated in the right order.
+    """
+    base = Lens(**KNOWN)
+    base.calculate()
+    table = lenscalc.sweep(base, {"r1": np.linspace(40, 60, 5), "r2": [-50, -40, -30]})
+
+    assert len(table) == 15
+    assert table["r1"].reshape(5, 3)[:, 0].tolist() == [40, 45, 50, 55, 60]
+    assert table["r2"].reshape(5, 3)[0].tolist() == [-50, -40, -30]
+
+    lens = Lens(**{**KNOWN, "r1": 45, "r2": -30})
+    lens.calculate()
+    assert compare_two_lenses(lens, table[5])
+
+
+def test_sweep_zip():
+    """
+    Test that the values are used together.
+    """
+    table = lenscalc.sweep(KNOWN, {"r1": [40, 50], "CT": [2, 4]}, mode="zip")
+
+    lens = Lens(**{**KNOWN, "r1": 50, "CT": 4})
+    lens.calculate()
+    assert len(table) == 2
+    assert compare_two_lenses(lens, table[1])
+
+
+def test_sweep_errors():
+    """
+    Test the wrong arguments.
+    """
+    with pytest.raises(ValueError):
+        lenscalc.sweep(KNOWN, {"r1": [40, 50], "CT": [2]}, mode="zip")
+    with pytest.raises(ValueError):
+        lenscalc.sweep(KNOWN, {"r1": [40]}, mode="cube")
+    with pytest.raises(ValueError, match="don't determine"):
+        lenscalc.sweep({"n1": 1}, {"r1": [40]})
+
+    with pytest.raises(ValueError, match="over-determine the lens, remove one of: .*r1"):
+        lenscalc.sweep(Lens(**KNOWN), {"BFL": [40, 60]})
+
+
+@pytest.mark.parametrize("kind", ["compact", "row"])
+def test_sweep_calculated_base(kind):
+    """
+    Test that only the given values of a calculated compact lens
+    or a row of a table are used, not the calculated ones.
+    """
+    if kind == "compact":
+        base = CompactLens(**KNOWN)
+        base.calculate()
+    else:
+        table = LensTable.from_columns(KNOWN)
+        table.calculate()
+        base = table[0]
+
+    table = lenscalc.sweep(base, {"r1": [40, 60]})
+    result = lenscalc.tolerance(base, {"r1": 0.05}, samples=100)
+
+    lens = Lens(**{**KNOWN, "r1": 60})
+    lens.calculate()
+    assert compare_two_lenses(lens, table[1])
+    assert result["invalid"] == 0
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from lenscalc import Lens, LensSystem, LensTable
+from test_variable_combinations import ORIGINAL_LENS
+
+
+def test_system_single_lens():
+    """
+    Test that the system with one lens is the same as the lens.
+    """
+    system = LensSystem([ORIGINAL_LENS])
+    system.calculate()
+
+    for variable in LensSystem.variables:
+        assert getattr(system, variable) == pytest.approx(float(getattr(ORIGINAL_LENS, variable)), abs=1e-12)
+
+
+def test_system_split_lens():
+    """
+    Test the lens split into two plano lenses in contact
+    (the medium between them is the glass).
+    """
+    lens = Lens(n1=1.0003, nL=1.5, n2=1.33, r1=50, r2=-40, CT=3)
+    lens.calculate()
+    first = {"n1": 1.0003, "nL": 1.5, "n2": 1.5, "r1": 50, "r2": np.inf, "CT": 1}
+    second = {"n1": 1.5, "nL": 1.5, "n2": 1.33, "r1": np.inf, "r2": -40, "CT": 1.5}
+    system = LensSystem([first, second], gaps=[0.5])
+    system.calculate()
+
+    for variable in LensSystem.variables:
+        assert getattr(system, variable) == pytest.approx(getattr(lens, variable))
+
+
+def test_system_batch():
+    """
+    Test that the variants of the system are calculated the same
+    as the systems one by one.
+    """
+    table = LensTable.from_columns({"n1": 1, "nL": 1.5, "n2": 1, "r1": [50, 60, 70], "r2": -40, "CT": 3})
+    second = Lens(n1=1, nL=1.7, n2=1, r1=-40, r2=-100, CT=2)
+    gaps = np.array([1, 2, 5])
+    system = LensSystem([table, second], gaps=[gaps])
+    system.calculate()
+
+    for index in range(3):
+        single = LensSystem([table[index], second], gaps=[gaps[index]])
+        single.calculate()
+        assert system.BFL[index] == pytest.approx(single.BFL)
+        assert system.P1[index] == pytest.approx(single.P1)
+
+    with pytest.raises(ValueError, match="medium"):
+        LensSystem([table, Lens(n1=1.33, nL=1.5, n2=1, r1=40, r2=-40, CT=2)], gaps=[1]).calculate()
@@ -0,0 +1,129 @@
+from math import isclose
+
+import numpy as np
+import pytest
+
+from lenscalc import CompactLens, Lens, LensTable
+from test_variable_combinations import compare_two_lenses, ORIGINAL_LENS
+
+KNOWN = {"n1": 1.0003, "nL": 1.5, "n2": 1.0003, "r1": 50, "r2": -40, "CT": 3}
+
+
+def test_table_calculation():
+    """
+    Test calculation of lenses with different known variables at once.
+    """
+    table = LensTable.from_columns({**KNOWN, "r1": [50, 50]})
+    table[1].r1 = None
+    table[1].BFL = 44.0848506784985
+    table.calculate()
+
+    for lens in table:
+        assert compare_two_lenses(ORIGINAL_LENS, lens)
+
+
+def test_table_calculation_errors():
+    """
+    Test that the lenses which can't be calculated don't stop the others.
+    """
+    table = LensTable.from_columns({**KNOWN, "r1": [50, 50]})
+    table[1].CT = None
+
+    errors = table.calculate()
+
+    assert compare_two_lenses(ORIGINAL_LENS, table[0])
+    assert np.isnan(table["BFL"][1])
+    assert [rows.tolist() for rows in errors.values()] == [[1]]
+
+
+def test_table_known():
+    """
+    Test that the calculated values aren't marked as known
+    and that the lens is calculated again from the known values.
+    """
+    table = LensTable.from_columns(KNOWN)
+    known = table.known.copy()
+    table.calculate()
+
+    assert np.array_equal(table.known, known)
+    assert table[0].replacements == KNOWN
+
+    table[0].r2 = -50
+    table.calculate()
+    assert isclose(table["r2"][0], -50)
+    assert not isclose(table["BFL"][0], ORIGINAL_LENS.BFL)
+
+
+def test_table_row_view():
+    """
+    Test that the row of the table works as a lens using the table.
+    """
+    table = LensTable.from_columns(KNOWN)
+    lens = table[0]
+    lens.calculate()
+
+    assert compare_two_lenses(ORIGINAL_LENS, lens)
+    assert isclose(table["BFL"][0], ORIGINAL_LENS.BFL)
+    assert table.known[0] == Lens._mask(KNOWN, False)
+
+
+def test_table_from_lenses():
+    """
+    Test creating the table from lenses.
+    """
+    table = LensTable.from_lenses([ORIGINAL_LENS, Lens(r1=50)])
+
+    assert len(table) == 2
+    assert compare_two_lenses(ORIGINAL_LENS, table[0])
+    assert table[1].replacements == {"r1": 50}
+
+
+def test_table_from_calculated_lenses():
+    """
+    Test that only the given values of calculated lenses are known,
+    so a changed row is calculated again.
+    """
+    lens = Lens(**KNOWN)
+    lens.calculate()
+    compact = CompactLens(**KNOWN)
+    compact.calculate()
+
+    table = LensTable.from_lenses([lens, compact])
+    assert list(table.known) == [Lens._mask(KNOWN, False)] * 2
+    assert compare_two_lenses(ORIGINAL_LENS, table[0])
+
+    for row in table:
+        row.r1 = 2 * KNOWN["r1"]
+    assert table.calculate() == {}
+
+    expected = Lens(**{**KNOWN, "r1": 2 * KNOWN["r1"]})
+    expected.calculate()
+    for index in range(len(table)):
+        assert isclose(table["BFL"][index], expected.BFL)
+        assert not isclose(table["BFL"][index], ORIGINAL_LENS.BFL)
+
+
+def test_table_export():
+    """
+    Test that the export to NumPy and pandas doesn't copy the values.
+    """
+    table = LensTable.from_columns(KNOWN)
+
+    assert table.to_numpy() is table.values
+
+    pandas = pytest.importorskip("pandas")
+    frame = table.to_pandas()
+    assert isinstance(frame, pandas.DataFrame)
+    assert np.shares_memory(frame["r1"].to_numpy(), table.values)
+
+
+def test_table_export_arrow():
+    """
+    Test the export to Arrow.
+    """
+    pytest.importorskip("pyarrow")
+    table = LensTable.from_columns(KNOWN)
+    arrow = table.to_arrow()
+
+    assert arrow.column_names == list(Lens.variables)
+    assert arrow.column("r1").to_pylist() == [50]
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+import lenscalc
+from lenscalc import Lens
+
+KNOWN = {"n1": 1.0003, "nL": 1.5, "n2": 1.0003, "r1": 50, "r2": -40, "CT": 3}
+
+
+def test_tolerance():
+    """
+    Test the distributions of the lenses with random values
+    against the distribution calculated from all the values.
+    """
+    sigma = {"r1": 0.05, "r2": 0.05, "CT": 0.02, "nL": 1e-4}
+    result = lenscalc.tolerance(KNOWN, sigma, samples=5000, chunk_size=1000, percentiles=(5, 50, 95))
+
+    random = np.random.default_rng(1)
+    lenses = Lens.calculate_batch({
+        **KNOWN,
+        **{v: random.normal(KNOWN[v], deviation, 5000) for v, deviation in sigma.items()},
+    })
+    efl = result["distributions"]["EFL"]
+    assert result["invalid"] == 0 and efl.count == 5000
+    assert efl.mean == pytest.approx(np.mean(lenses["EFL"]), abs=3e-3)
+    assert efl.std == pytest.approx(np.std(lenses["EFL"]), rel=0.1)
+    assert result["percentiles"]["EFL"][5] < result["percentiles"]["EFL"][50] < result["percentiles"]["EFL"][95]
+    assert result["percentiles"]["EFL"][50] == pytest.approx(np.median(lenses["EFL"]), abs=3e-3)
+
+    with pytest.raises(ValueError):
+        lenscalc.tolerance(KNOWN, {"BFL": 1})
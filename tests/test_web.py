@@ -0,0 +1,117 @@
+import time
+from math import isclose
+
+import pytest
+
+pytest.importorskip("flask")
+
+import lenscalc_web.solver  # noqa: E402
+from lenscalc_web.app import app, variables_info  # noqa: E402
+from lenscalc_web.solver import Solver, SolverBusy, SolverTimeout  # noqa: E402
+from test_variable_combinations import ORIGINAL_LENS  # noqa: E402
+
+KNOWN = {"n1": 1.0003, "nL": 1.5, "n2": 1.0003, "r1": 50, "r2": -40, "CT": 3}
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def test_api_solve(client):
+    """
+    Test calculation of a lens with the JSON API.
+    """
+    response = client.post("/api/solve", json=KNOWN)
+
+    assert response.status_code == 200
+    assert isclose(response.get_json()["lens"]["BFL"], ORIGINAL_LENS.BFL)
+
+
+def test_api_solve_errors(client):
+    """
+    Test that wrong inputs are refused.
+    """
+    assert client.post("/api/solve", json={"n3": 1}).status_code == 400
+    assert client.post("/api/solve", json={"n1": "x"}).status_code == 400
+    assert client.post("/api/solve", json={}).status_code == 400
+
+    response = client.post("/api/solve", json={"n1": 1.0003, "n2": 1.0003, "r1": 50, "r2": -40, "CT": 3})
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("The known variables don't determine the lens! Give 1 more of:")
+
+
+def test_api_solve_batch(client):
+    """
+    Test calculation of more lenses, the wrong ones have an error.
+    """
+    response = client.post("/api/solve/batch", json=[KNOWN, {}, [1]])
+    results = response.get_json()["results"]
+
+    assert response.status_code == 200
+    assert isclose(results[0]["lens"]["BFL"], ORIGINAL_LENS.BFL)
+    assert results[1]["error"] == "No variables were given!"
+    assert "error" in results[2]
+
+
+def test_result_page(client):
+    """
+    Test that the result page doesn't change the shared `variables_info`.
+    """
+    response = client.get("/result/", query_string=KNOWN)
+
+    assert response.status_code == 200
+    assert b"44.08" in response.data
+    assert all("value" not in info for info in variables_info.values())
+
+
+def test_solver_timeout_and_busy(monkeypatch):
+    """
+    Test that the slow calculation times out and blocks only its slot.
+    """
+    monkeypatch.setattr(lenscalc_web.solver, "calculate", lambda values: time.sleep(0.5))
+    solver = Solver(workers=1, timeout=0.01, max_pending=1)
+
+    with pytest.raises(SolverTimeout):
+        solver.solve(KNOWN)
+    with pytest.raises(SolverBusy):
+        solver.solve(KNOWN)
+
+
+def test_solver_timeout_releases_slot(monkeypatch):
+    """
+    Test that the timed out lens frees its slot and that new lenses
+    are refused only when all the threads calculate abandoned lenses.
+    """
+    monkeypatch.setattr(lenscalc_web.solver, "calculate", lambda values: time.sleep(0.5))
+    solver = Solver(workers=2, timeout=0.01, max_pending=1)
+
+    with pytest.raises(SolverTimeout):
+        solver.solve(KNOWN)
+    with pytest.raises(SolverTimeout):
+        solver.solve(KNOWN)
+    with pytest.raises(SolverBusy):
+        solver.solve(KNOWN)
+
+    time.sleep(0.6)
+    assert not solver.abandoned
+
+
+def test_api_solve_batch_unexpected_error(client, monkeypatch):
+    """
+    Test that an unexpected error of one lens is reported only for it.
+    """
+    calculate = lenscalc_web.solver.calculate
+
+    def failing(values):
+        if values.get("CT") == 0:
+            raise ZeroDivisionError("division by zero")
+        return calculate(values)
+
+    monkeypatch.setattr(lenscalc_web.solver, "calculate", failing)
+    response = client.post("/api/solve/batch", json=[{**KNOWN, "CT": 0}, KNOWN])
+    results = response.get_json()["results"]
+
+    assert response.status_code == 200
+    assert results[0]["error"] == "division by zero"
+    assert isclose(results[1]["lens"]["BFL"], ORIGINAL_LENS.BFL)